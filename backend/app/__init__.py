@@ -1,10 +1,12 @@
 # backend/app/__init__.py
-from flask import Flask, send_from_directory, send_file
+from flask import Flask, send_from_directory, send_file, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from app.config import Config
+from app.log import setup_logging
+from app.passwords import PasswordHashingBusy
 import os
 
 db = SQLAlchemy()
@@ -14,10 +16,12 @@ jwt = JWTManager()
 def create_app():
     app = Flask(__name__, static_folder='../../frontend/dist', static_url_path='')
     app.config.from_object(Config)
+    setup_logging(app)
     
     db.init_app(app)
     migrate.init_app(app, db)
-    CORS(app)
+    # Expose pagination and caching headers to the frontend
+    CORS(app, expose_headers=['X-Next-Cursor', 'Link', 'ETag', 'X-Access-Token', 'X-Request-ID'])
     jwt.init_app(app)
     
     from app.routes.auth import auth_bp
@@ -27,6 +31,8 @@ def create_app():
     from app.routes.invites import invites_bp
     from app.routes.profile import profile_bp
     from app.routes.ai import ai_bp
+    from app.routes.notifications import notifications_bp
+    from app.routes.sync import sync_bp
     
     # Register API blueprints with /api prefix
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -36,6 +42,29 @@ def create_app():
     app.register_blueprint(invites_bp, url_prefix='/api/invites')
     app.register_blueprint(profile_bp, url_prefix='/api/profile')
     app.register_blueprint(ai_bp, url_prefix='/api/ai')
+    app.register_blueprint(notifications_bp, url_prefix='/api/notifications')
+    app.register_blueprint(sync_bp, url_prefix='/api/sync')
+    
+    # Outbox handlers, the CLI to run them, and background workers that start
+    # with the first request so CLI invocations never spawn them
+    from app.services import notifications
+    from app.services.outbox import WorkerPool
+    from app.commands import outbox_cli, notifications_cli, sync_cli
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(notifications_cli)
+    app.cli.add_command(sync_cli)
+    outbox_workers = WorkerPool(app)
+    
+    @app.before_request
+    def start_outbox_workers():
+        if not outbox_workers.threads:
+            outbox_workers.start()
+    
+    @app.errorhandler(PasswordHashingBusy)
+    def password_hashing_busy(e):
+        response = jsonify({'message': 'Too many sign-ins at once, please try again'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
     
     # Health check endpoint
     @app.route('/api/health')
@@ -0,0 +1,69 @@
+# backend/app/commands.py
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.services.outbox import WorkerPool, drain_all
+from app.services.notifications import digest_notifications
+from app.services.retention import archive_notifications, prune_change_log
+
+outbox_cli = AppGroup('outbox', help='Process the transactional outbox.')
+notifications_cli = AppGroup('notifications', help='Maintain the notification table.')
+sync_cli = AppGroup('sync', help='Maintain the change log read by delta sync.')
+
+@outbox_cli.command('drain')
+def drain_outbox():
+    """Run every due outbox message once and exit"""
+    count = drain_all(current_app.config['OUTBOX_BATCH_SIZE'])
+    click.echo(f'Processed {count} outbox messages')
+
+@outbox_cli.command('work')
+@click.option('--workers', type=int, help='Worker threads (default: OUTBOX_WORKERS, at least 1)')
+def work_outbox(workers):
+    """Drain the outbox continuously in the foreground"""
+    app = current_app._get_current_object()
+    pool = WorkerPool(app)
+    pool.size = workers or max(pool.size, 1)
+    pool.start()
+    click.echo(f'Outbox workers running: {pool.size}')
+    for thread in pool.threads:
+        thread.join()
+
+@notifications_cli.command('archive')
+@click.option('--read-days', type=int, help='Archive read notifications older than this (default: NOTIFICATION_READ_TTL_DAYS)')
+@click.option('--unread-days', type=int, help='Archive unread notifications older than this (default: NOTIFICATION_UNREAD_TTL_DAYS)')
+@click.option('--batch-size', type=int, help='Rows moved per transaction (default: NOTIFICATION_ARCHIVE_BATCH_SIZE)')
+def archive_notifications_command(read_days, unread_days, batch_size):
+    """Move notifications past their retention period to notification_archive"""
+    config = current_app.config
+    moved = archive_notifications(
+        config['NOTIFICATION_READ_TTL_DAYS'] if read_days is None else read_days,
+        config['NOTIFICATION_UNREAD_TTL_DAYS'] if unread_days is None else unread_days,
+        batch_size or config['NOTIFICATION_ARCHIVE_BATCH_SIZE'],
+        on_batch=lambda count: click.echo(f'Moved a batch of {count}')
+    )
+    click.echo(f'Archived {moved} notifications')
+
+@notifications_cli.command('digest')
+@click.option('--types', help='Comma-separated notification types to roll up (default: NOTIFICATION_DIGEST_TYPES)')
+@click.option('--min-count', type=int, help='Unread notifications a user needs before they are rolled up (default: NOTIFICATION_DIGEST_MIN_COUNT)')
+def digest_notifications_command(types, min_count):
+    """Roll each user's pile of unread notifications into one digest; run it periodically"""
+    config = current_app.config
+    written = digest_notifications(
+        types.split(',') if types else config['NOTIFICATION_DIGEST_TYPES'],
+        min_count or config['NOTIFICATION_DIGEST_MIN_COUNT']
+    )
+    click.echo(f'Wrote {written} notification digests')
+
+@sync_cli.command('prune')
+@click.option('--ttl-days', type=int, help='Days sync cursors stay valid; rows a day older are deleted (default: CHANGE_LOG_TTL_DAYS)')
+@click.option('--batch-size', type=int, help='Rows deleted per transaction (default: CHANGE_LOG_PRUNE_BATCH_SIZE)')
+def prune_change_log_command(ttl_days, batch_size):
+    """Delete change_log rows older than any valid sync cursor; run it periodically"""
+    config = current_app.config
+    deleted = prune_change_log(
+        config['CHANGE_LOG_TTL_DAYS'] if ttl_days is None else ttl_days,
+        batch_size or config['CHANGE_LOG_PRUNE_BATCH_SIZE'],
+        on_batch=lambda count: click.echo(f'Deleted a batch of {count}')
+    )
+    click.echo(f'Pruned {deleted} change log rows')
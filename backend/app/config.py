@@ -30,4 +30,68 @@ class Config:
             'pool_pre_ping': True,
             'pool_recycle': 300,
         }
-    
\ No newline at end of file
+    else:
+        # SQLite serializes writers; wait for the lock longer than the 5s default
+        # so bursts of concurrent writes queue up instead of failing
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'connect_args': {'timeout': 30},
+        }
+    
+    
+    # Background threads per process draining the transactional outbox;
+    # set to 0 and run `flask outbox work` to drain it from a separate process
+    OUTBOX_WORKERS = int(os.environ.get('OUTBOX_WORKERS', 2))
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 100))
+    # Seconds an idle worker waits before polling again; commits wake it earlier
+    OUTBOX_POLL_INTERVAL = float(os.environ.get('OUTBOX_POLL_INTERVAL', 5))
+    
+    # Seconds between polls of the notification table feeding SSE streams
+    NOTIFICATION_POLL_INTERVAL = float(os.environ.get('NOTIFICATION_POLL_INTERVAL', 1))
+    # Streams are closed after this many seconds; browsers reconnect and resume
+    # from Last-Event-ID, so no connection holds a worker thread indefinitely
+    NOTIFICATION_STREAM_MAX_SECONDS = int(os.environ.get('NOTIFICATION_STREAM_MAX_SECONDS', 300))
+    # Open streams per process; each pins one of its request threads (see
+    # Procfile.dev), so keep this well below the thread count. Past it,
+    # clients get a 503 and retry
+    NOTIFICATION_STREAMS_PER_PROCESS = int(os.environ.get('NOTIFICATION_STREAMS_PER_PROCESS', 8))
+    # Seconds a notification id is waited on for lower ids still committing
+    NOTIFICATION_STREAM_LOOKBACK_SECONDS = float(os.environ.get('NOTIFICATION_STREAM_LOOKBACK_SECONDS', 30))
+    # Lifetime of the tokens that open a stream; only checked on connect
+    NOTIFICATION_STREAM_TOKEN_SECONDS = int(os.environ.get('NOTIFICATION_STREAM_TOKEN_SECONDS', 60))
+    
+    # Notifications older than these many days are moved to notification_archive
+    # by `flask notifications archive`; 0 keeps them forever
+    NOTIFICATION_READ_TTL_DAYS = int(os.environ.get('NOTIFICATION_READ_TTL_DAYS', 30))
+    NOTIFICATION_UNREAD_TTL_DAYS = int(os.environ.get('NOTIFICATION_UNREAD_TTL_DAYS', 180))
+    # Rows moved per transaction, keeping each one's locks short
+    NOTIFICATION_ARCHIVE_BATCH_SIZE = int(os.environ.get('NOTIFICATION_ARCHIVE_BATCH_SIZE', 1000))
+    
+    # Sync cursors older than these many days get 410 and the client reloads;
+    # `flask sync prune` deletes change_log rows a day past it. 0 keeps them forever
+    CHANGE_LOG_TTL_DAYS = int(os.environ.get('CHANGE_LOG_TTL_DAYS', 30))
+    CHANGE_LOG_PRUNE_BATCH_SIZE = int(os.environ.get('CHANGE_LOG_PRUNE_BATCH_SIZE', 1000))
+    
+    # Unread notifications about the same thing (user, type, related_id) created
+    # within this many minutes are merged into one row with a count; 0 disables
+    NOTIFICATION_COALESCE_MINUTES = int(os.environ.get('NOTIFICATION_COALESCE_MINUTES', 60))
+    # `flask notifications digest` rolls a user's unread notifications of these
+    # types into one once they add up to NOTIFICATION_DIGEST_MIN_COUNT
+    NOTIFICATION_DIGEST_TYPES = os.environ.get('NOTIFICATION_DIGEST_TYPES', 'rsvp_new,rsvp_update').split(',')
+    NOTIFICATION_DIGEST_MIN_COUNT = int(os.environ.get('NOTIFICATION_DIGEST_MIN_COUNT', 10))
+    
+    # Logging goes through a queue to one writer thread (app/log.py). LOG_LEVELS
+    # overrides LOG_LEVEL per logger as 'name=LEVEL,name=LEVEL'; only a
+    # LOG_DEBUG_SAMPLE_RATE share of DEBUG records is kept, and records are
+    # dropped rather than waited on once LOG_QUEUE_SIZE are pending
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+    LOG_LEVELS = os.environ.get('LOG_LEVELS', '')
+    LOG_DEBUG_SAMPLE_RATE = float(os.environ.get('LOG_DEBUG_SAMPLE_RATE', 0.01))
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+    
+    # werkzeug generate_password_hash method, e.g. 'scrypt:32768:8:1' or
+    # 'pbkdf2:sha256:1000000'; older hashes are upgraded when their user logs in
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    # Hashes computed at once per process, and how many more may wait before
+    # requests needing one get a 503
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', 16))
@@ -0,0 +1,133 @@
+# backend/app/log.py
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, has_request_context, request
+
+# Attributes every LogRecord has; anything else was passed in extra= and is
+# written out as a field of the JSON line
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id'}
+
+# Request ids accepted from clients in X-Request-ID; anything else is replaced
+# with a generated id rather than logged and echoed back
+CLIENT_REQUEST_ID = re.compile(r'[A-Za-z0-9._:-]{1,64}')
+
+_listener = None
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the id of the request that logged them"""
+    
+    def filter(self, record):
+        record.request_id = g.get('request_id') if has_request_context() else None
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keep only a ``rate`` fraction of DEBUG records; other levels all pass"""
+    
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+    
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or random.random() < self.rate
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without ever waiting on it.
+    
+    The caller only builds the message and, for errors, the traceback text;
+    when the queue is full the record is counted and dropped instead of
+    blocking the request.
+    """
+    
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, request id and extra= fields"""
+    
+    def format(self, record):
+        data = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if getattr(record, 'request_id', None):
+            data['request_id'] = record.request_id
+        data.update((key, value) for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES)
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        return json.dumps(data, default=str)
+
+def parse_levels(spec):
+    """{'logger': 'LEVEL'} from 'name=LEVEL,other=LEVEL'"""
+    levels = {}
+    for item in spec.split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+def setup_logging(app):
+    """
+    Route all logging through a bounded queue drained by one background
+    thread writing JSON lines to stdout, and give every request an id.
+    """
+    global _listener
+    config = app.config
+    
+    root = logging.getLogger()
+    root.setLevel(config['LOG_LEVEL'])
+    for name, level in parse_levels(config['LOG_LEVELS']).items():
+        logging.getLogger(name).setLevel(level)
+    
+    # create_app may run more than once per process; keep a single pipeline
+    if _listener is None:
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(JsonFormatter())
+        log_queue = queue.Queue(maxsize=config['LOG_QUEUE_SIZE'])
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.addFilter(SamplingFilter(config['LOG_DEBUG_SAMPLE_RATE']))
+        handler.addFilter(RequestIdFilter())
+        for existing in root.handlers[:]:
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        _listener = QueueListener(log_queue, stream)
+        _listener.start()
+        # Flush what is still queued when the process exits
+        atexit.register(_listener.stop)
+    
+    @app.before_request
+    def assign_request_id():
+        client_id = request.headers.get('X-Request-ID', '')
+        g.request_id = client_id if CLIENT_REQUEST_ID.fullmatch(client_id) else uuid.uuid4().hex
+    
+    @app.after_request
+    def return_request_id(response):
+        if 'request_id' in g:
+            response.headers['X-Request-ID'] = g.request_id
+        return response
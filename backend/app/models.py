@@ -1,23 +1,81 @@
 # backend/app/models.py
 from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.passwords import hash_password, verify_password, needs_rehash
+from sqlalchemy import DDL, event as sa_event, false as sa_false, literal_column, update
+from sqlalchemy.orm import joinedload, selectinload, load_only
+from sqlalchemy.dialects import postgresql, sqlite
 from datetime import datetime
 
+def serialization_options(model, fields=None, include=(), columns=()):
+    """
+    Loader options that fetch exactly what model.to_dict(fields, include) reads.
+    
+    Each model declares ``field_sources`` (the columns and relationship paths
+    behind every to_dict() key) and ``include_sources`` (the paths behind each
+    optional ?include=). With ``fields`` given, only those columns are selected
+    (plus any extra ``columns``, e.g. a sort key); otherwise whole rows are
+    loaded. Many-to-one hops are joined into the main SELECT and collections
+    use one SELECT ... IN, so a list query costs a fixed number of statements
+    regardless of row count.
+    """
+    paths = []
+    for name in (model.field_sources if fields is None else fields):
+        paths.extend(model.field_sources.get(name, ()))
+    for name in include:
+        paths.extend(model.include_sources[name])
+    paths.extend(columns)
+    return _load_options(model, paths, project=fields is not None)
+
+def _load_options(model, paths, project):
+    """Build loader options for dotted attribute paths relative to ``model``"""
+    column_names = set()
+    relationships = {}
+    for path in paths:
+        name, _, rest = path.partition('.')
+        if hasattr(getattr(model, name).property, 'mapper'):
+            relationships.setdefault(name, []).append(rest)
+        else:
+            column_names.add(name)
+    
+    options = []
+    if project:
+        primary_keys = [column.key for column in model.__mapper__.primary_key]
+        options.append(load_only(*[getattr(model, name) for name in column_names.union(primary_keys)]))
+    for name, rests in relationships.items():
+        attr = getattr(model, name)
+        loader = selectinload(attr) if attr.property.uselist else joinedload(attr)
+        # An empty remainder means the whole related row is needed
+        child_options = _load_options(attr.property.mapper.class_, [r for r in rests if r], project='' not in rests)
+        options.append(loader.options(*child_options) if child_options else loader)
+    return options
+
+def select_fields(getters, fields):
+    """Evaluate only the requested getters; fields=None means all of them"""
+    return {name: getter() for name, getter in getters.items() if fields is None or name in fields}
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)  # Increased from 120 to 255 for scrypt hashes
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Bumped whenever anything in this user's lists changes; drives ETags
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    data_updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Bumped to revoke every calendar feed URL handed out so far
+    feed_token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     events = db.relationship('Event', backref='creator', lazy=True)
     rsvps = db.relationship('RSVP', backref='user', lazy=True)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        return needs_rehash(self.password_hash)
     
     def to_dict(self):
         return {
@@ -35,21 +93,98 @@ class Event(db.Model):
     location = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    # Denormalized child counts, kept in step by the task and RSVP write routes
+    tasks_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rsvps_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Bumped whenever the event, its tasks or its RSVPs change; drives ETags
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # RRULE subset (see app/services/recurrence.py); date is the first occurrence
+    recurrence_rule = db.Column(db.String(255))
+    # Start of the last occurrence, NULL while the series is open-ended
+    recurrence_end = db.Column(db.DateTime)
     
     tasks = db.relationship('Task', backref='event', lazy=True, cascade='all, delete-orphan')
     rsvps = db.relationship('RSVP', backref='event', lazy=True, cascade='all, delete-orphan')
+    occurrences = db.relationship('EventOccurrence', backref='event', lazy=True, cascade='all, delete-orphan')
+    
+    __table_args__ = (
+        db.Index('ix_event_user_id_date', 'user_id', 'date'),
+        db.Index('ix_event_date', 'date'),
+    )
+    
+    # Columns and relationship paths behind each to_dict() key, for ?fields=
+    field_sources = {
+        'id': ['id'],
+        'title': ['title'],
+        'description': ['description'],
+        'date': ['date'],
+        'location': ['location'],
+        'created_at': ['created_at'],
+        'creator': ['creator.username'],
+        'tasks_count': ['tasks_count'],
+        'rsvps_count': ['rsvps_count'],
+        'recurrence_rule': ['recurrence_rule'],
+    }
+    # Optional related data for ?include=
+    include_sources = {
+        'tasks': ['tasks'],
+        # RSVP.to_dict() also reads the parent event's title
+        'rsvps': ['rsvps', 'rsvps.user.username', 'title'],
+    }
+    
+    def to_dict(self, fields=None, include=()):
+        data = select_fields({
+            'id': lambda: self.id,
+            'title': lambda: self.title,
+            'description': lambda: self.description,
+            'date': lambda: self.date.isoformat(),
+            'location': lambda: self.location,
+            'created_at': lambda: self.created_at.isoformat(),
+            'creator': lambda: self.creator.username,
+            'tasks_count': lambda: self.tasks_count,
+            'rsvps_count': lambda: self.rsvps_count,
+            'recurrence_rule': lambda: self.recurrence_rule
+        }, fields)
+        if 'tasks' in include:
+            data['tasks'] = [task.to_dict() for task in self.tasks]
+        if 'rsvps' in include:
+            data['rsvps'] = [rsvp.to_dict() for rsvp in self.rsvps]
+        return data
+    
+    @classmethod
+    def adjust_count(cls, event_id, column, delta):
+        """Atomically add delta to one of the counter columns inside the current transaction"""
+        cls.query.filter_by(id=event_id).update({column: column + delta})
+
+class EventOccurrence(db.Model):
+    """A cancelled or edited occurrence of a recurring event; untouched occurrences have no row"""
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
+    # The start the rule generates for this occurrence
+    original_date = db.Column(db.DateTime, nullable=False)
+    cancelled = db.Column(db.Boolean, nullable=False, default=False, server_default=sa_false())
+    # Overridden values; NULL keeps the series value
+    date = db.Column(db.DateTime)
+    title = db.Column(db.String(200))
+    description = db.Column(db.Text)
+    location = db.Column(db.String(200))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('event_id', 'original_date', name='unique_event_occurrence'),
+    )
     
     def to_dict(self):
         return {
             'id': self.id,
+            'event_id': self.event_id,
+            'original_date': self.original_date.isoformat(),
+            'cancelled': self.cancelled,
+            'date': self.date.isoformat() if self.date else None,
             'title': self.title,
             'description': self.description,
-            'date': self.date.isoformat(),
             'location': self.location,
-            'created_at': self.created_at.isoformat(),
-            'creator': self.creator.username,
-            'tasks_count': len(self.tasks),
-            'rsvps_count': len(self.rsvps)
+            'created_at': self.created_at.isoformat()
         }
 
 class Task(db.Model):
@@ -61,16 +196,32 @@ class Task(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'completed': self.completed,
-            'due_date': self.due_date.isoformat() if self.due_date else None,
-            'created_at': self.created_at.isoformat(),
-            'event_id': self.event_id
-        }
+    __table_args__ = (db.Index('ix_task_event_id', 'event_id'),)
+    
+    field_sources = {
+        'id': ['id'],
+        'title': ['title'],
+        'description': ['description'],
+        'completed': ['completed'],
+        'due_date': ['due_date'],
+        'created_at': ['created_at'],
+        'event_id': ['event_id'],
+    }
+    include_sources = {'event': ['event', 'event.creator.username']}
+    
+    def to_dict(self, fields=None, include=()):
+        data = select_fields({
+            'id': lambda: self.id,
+            'title': lambda: self.title,
+            'description': lambda: self.description,
+            'completed': lambda: self.completed,
+            'due_date': lambda: self.due_date.isoformat() if self.due_date else None,
+            'created_at': lambda: self.created_at.isoformat(),
+            'event_id': lambda: self.event_id
+        }, fields)
+        if 'event' in include:
+            data['event'] = self.event.to_dict()
+        return data
 
 class RSVP(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -80,7 +231,23 @@ class RSVP(db.Model):
     message = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    __table_args__ = (db.UniqueConstraint('user_id', 'event_id', name='unique_user_event_rsvp'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'event_id', name='unique_user_event_rsvp'),
+        # Covers the per-event status counts as well as lookups by event
+        db.Index('ix_rsvp_event_id_status', 'event_id', 'status'),
+    )
+    
+    field_sources = {
+        'id': ['id'],
+        'user': ['user.username'],
+        'event': ['event.title'],
+        'status': ['status'],
+        'message': ['message'],
+        'created_at': ['created_at'],
+    }
+    include_sources = {}
+    
+    STATUSES = ('Going', 'Maybe', 'Not Going')
     
     def to_dict(self):
         return {
@@ -91,6 +258,41 @@ class RSVP(db.Model):
             'message': self.message,
             'created_at': self.created_at.isoformat()
         }
+    
+    @classmethod
+    def upsert(cls, user_id, event_id, status, message):
+        """
+        Insert the user's RSVP to an event, or update it if one exists, with
+        INSERT ... ON CONFLICT on unique_user_event_rsvp so concurrent
+        requests cannot race. Returns (rsvp id, whether a row was inserted).
+        """
+        values = dict(user_id=user_id, event_id=event_id, status=status, message=message, created_at=datetime.utcnow())
+        if db.session.get_bind().dialect.name == 'postgresql':
+            stmt = postgresql.insert(cls).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['user_id', 'event_id'],
+                set_={'status': stmt.excluded.status, 'message': stmt.excluded.message}
+            ).returning(cls.id, literal_column('xmax = 0', db.Boolean))
+            # xmax is 0 only on a freshly inserted row version
+            rsvp_id, inserted = db.session.execute(stmt).one()
+            return rsvp_id, inserted
+        
+        # SQLite has no such marker, so insert-or-skip tells the two apart;
+        # the INSERT takes the database's write lock, so nothing can change
+        # the row before the UPDATE that follows a skip
+        rsvp_id = db.session.execute(
+            sqlite.insert(cls).values(**values).on_conflict_do_nothing(
+                index_elements=['user_id', 'event_id']
+            ).returning(cls.id)
+        ).scalar()
+        if rsvp_id is not None:
+            return rsvp_id, True
+        rsvp_id = db.session.execute(
+            update(cls).where(cls.user_id == user_id, cls.event_id == event_id).values(
+                status=status, message=message
+            ).returning(cls.id)
+        ).scalar_one()
+        return rsvp_id, False
 
 class Invite(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -108,22 +310,46 @@ class Invite(db.Model):
     inviter = db.relationship('User', foreign_keys=[inviter_id], backref='sent_invites')
     invitee = db.relationship('User', foreign_keys=[invitee_id], backref='received_invites')
     
-    __table_args__ = (db.UniqueConstraint('event_id', 'invitee_email', name='unique_event_invitee'),)
+    __table_args__ = (
+        db.UniqueConstraint('event_id', 'invitee_email', name='unique_event_invitee'),
+        db.Index('ix_invite_invitee_id', 'invitee_id'),
+        # Covers the per-event status rollup of sent invites
+        db.Index('ix_invite_inviter_id_event_id_status', 'inviter_id', 'event_id', 'status'),
+        db.Index('ix_invite_event_id_created_at', 'event_id', 'created_at'),
+    )
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'event_id': self.event_id,
-            'event_title': self.event.title,
-            'event_date': self.event.date.isoformat(),
-            'inviter': self.inviter.username,
-            'invitee_email': self.invitee_email,
-            'invitee': self.invitee.username if self.invitee else None,
-            'status': self.status,
-            'message': self.message,
-            'created_at': self.created_at.isoformat(),
-            'responded_at': self.responded_at.isoformat() if self.responded_at else None
-        }
+    field_sources = {
+        'id': ['id'],
+        'event_id': ['event_id'],
+        'event_title': ['event.title'],
+        'event_date': ['event.date'],
+        'inviter': ['inviter.username'],
+        'invitee_email': ['invitee_email'],
+        'invitee': ['invitee.username'],
+        'status': ['status'],
+        'message': ['message'],
+        'created_at': ['created_at'],
+        'responded_at': ['responded_at'],
+    }
+    include_sources = {'event': ['event', 'event.creator.username']}
+    
+    def to_dict(self, fields=None, include=()):
+        data = select_fields({
+            'id': lambda: self.id,
+            'event_id': lambda: self.event_id,
+            'event_title': lambda: self.event.title,
+            'event_date': lambda: self.event.date.isoformat(),
+            'inviter': lambda: self.inviter.username,
+            'invitee_email': lambda: self.invitee_email,
+            'invitee': lambda: self.invitee.username if self.invitee else None,
+            'status': lambda: self.status,
+            'message': lambda: self.message,
+            'created_at': lambda: self.created_at.isoformat(),
+            'responded_at': lambda: self.responded_at.isoformat() if self.responded_at else None
+        }, fields)
+        if 'event' in include:
+            data['event'] = self.event.to_dict()
+        return data
 
 class Notification(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -133,10 +359,23 @@ class Notification(db.Model):
     message = db.Column(db.Text, nullable=False)
     related_id = db.Column(db.Integer)  # Could be invite_id, event_id, etc.
     read = db.Column(db.Boolean, default=False)
+    # Repeats folded into this row while it was unread, itself included
+    count = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     user = db.relationship('User', backref='notifications')
     
+    __table_args__ = (
+        db.Index('ix_notification_user_id_created_at', 'user_id', 'created_at'),
+        # Finds rows past their retention period
+        db.Index('ix_notification_read_created_at', 'read', 'created_at'),
+        # Partial index holding only unread rows, for the navbar badge count
+        db.Index(
+            'ix_notification_user_id_unread', 'user_id',
+            sqlite_where=read == sa_false(), postgresql_where=read == sa_false()
+        ),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -145,5 +384,79 @@ class Notification(db.Model):
             'message': self.message,
             'related_id': self.related_id,
             'read': self.read,
+            'count': self.count,
             'created_at': self.created_at.isoformat()
         }
+
+class NotificationArchive(db.Model):
+    """Notifications past their retention period, moved out of the live table by `flask notifications archive`"""
+    # Keeps the id the notification had
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    type = db.Column(db.String(50), nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    related_id = db.Column(db.Integer)
+    read = db.Column(db.Boolean, default=False)
+    count = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (db.Index('ix_notification_archive_user_id_created_at', 'user_id', 'created_at'),)
+
+class OutboxMessage(db.Model):
+    """A side effect recorded in the transaction that caused it, run later by app/services/outbox.py"""
+    id = db.Column(db.Integer, primary_key=True)
+    topic = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Not picked up before this time; pushed forward while claimed and after failures
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claim_token = db.Column(db.String(32))
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (db.Index('ix_outbox_message_available_at', 'available_at'),)
+
+# Full-text search index for events, maintained by app/services/search.py.
+# SQLite uses an FTS5 table keyed by event id, PostgreSQL a tsvector column
+# with a GIN index; neither is an ORM column, so create_all needs these hooks.
+sa_event.listen(Event.__table__, 'after_create', DDL(
+    "CREATE VIRTUAL TABLE IF NOT EXISTS event_fts "
+    "USING fts5(title, description, location, tokenize='porter unicode61')"
+).execute_if(dialect='sqlite'))
+sa_event.listen(Event.__table__, 'before_drop', DDL(
+    'DROP TABLE IF EXISTS event_fts'
+).execute_if(dialect='sqlite'))
+sa_event.listen(Event.__table__, 'after_create', DDL(
+    'ALTER TABLE event ADD COLUMN IF NOT EXISTS search_vector tsvector'
+).execute_if(dialect='postgresql'))
+sa_event.listen(Event.__table__, 'after_create', DDL(
+    'CREATE INDEX IF NOT EXISTS ix_event_search_vector ON event USING GIN (search_vector)'
+).execute_if(dialect='postgresql'))
+
+class ChangeLog(db.Model):
+    """
+    One insert, update or delete of a row clients sync, written in the
+    transaction that made it and read by GET /api/sync.
+    
+    A change is visible to everyone who can currently see ``event_id``, or
+    only to ``user_id``. Neither is a foreign key: tombstones outlive the
+    rows they refer to.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)  # events, tasks, rsvps, invites, notifications, users
+    entity_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)  # insert, update, delete
+    event_id = db.Column(db.Integer)
+    user_id = db.Column(db.Integer)
+    # Transaction that logged it on PostgreSQL, 0 on SQLite; sync reads in
+    # (xact_id, id) order, see app.services.changes.changes_since
+    xact_id = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_change_log_user_id_xact_id_id', 'user_id', 'xact_id', 'id'),
+        db.Index('ix_change_log_event_id_xact_id_id', 'event_id', 'xact_id', 'id'),
+        db.Index('ix_change_log_created_at', 'created_at'),
+    )
@@ -0,0 +1,50 @@
+# backend/app/passwords.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+class PasswordHashingBusy(Exception):
+    """More password hashes are running or waiting than the pool allows"""
+
+def _run(function, *args):
+    """
+    Run a password hash on the shared pool and wait for it.
+    
+    Hashing releases the GIL, so the waiting request thread costs nothing;
+    the pool caps how many hashes burn CPU and memory at once, and once
+    PASSWORD_HASH_QUEUE_SIZE more are waiting, callers are turned away with
+    PasswordHashingBusy instead of piling up behind them.
+    """
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            workers = current_app.config['PASSWORD_HASH_WORKERS']
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+            _slots = threading.BoundedSemaphore(workers + current_app.config['PASSWORD_HASH_QUEUE_SIZE'])
+    if not _slots.acquire(blocking=False):
+        raise PasswordHashingBusy()
+    future = _executor.submit(function, *args)
+    future.add_done_callback(lambda _: _slots.release())
+    return future.result()
+
+@lru_cache(maxsize=8)
+def _hash_prefix(method):
+    """The method and parameters werkzeug writes in front of hashes made with ``method``"""
+    return _run(generate_password_hash, '', method).split('$', 1)[0]
+
+def hash_password(password):
+    """Hash with the configured PASSWORD_HASH_METHOD"""
+    return _run(generate_password_hash, password, current_app.config['PASSWORD_HASH_METHOD'])
+
+def verify_password(password_hash, password):
+    return _run(check_password_hash, password_hash, password)
+
+def needs_rehash(password_hash):
+    """Whether the hash was made with other parameters than PASSWORD_HASH_METHOD"""
+    return password_hash.split('$', 1)[0] != _hash_prefix(current_app.config['PASSWORD_HASH_METHOD'])
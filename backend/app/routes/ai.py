@@ -1,9 +1,11 @@
 # backend/app/routes/ai.py
 from flask import Blueprint, request, jsonify
 from app.services.ai_service import AIService
-from app.utils import jwt_required_custom, get_current_user
+from app.utils import jwt_required_custom, get_current_identity
 from app.models import Event
-import traceback
+import logging
+
+logger = logging.getLogger(__name__)
 
 ai_bp = Blueprint('ai', __name__)
 ai_service = AIService()
@@ -13,7 +15,7 @@ ai_service = AIService()
 def generate_description():
     """Generate event description using AI"""
     try:
-        current_user = get_current_user()
+        current_user = get_current_identity()
         if not current_user:
             return jsonify({'message': 'User not found'}), 404
         
@@ -35,9 +37,8 @@ def generate_description():
         
         return jsonify({'description': description})
         
-    except Exception as e:
-        print(f"Error generating description: {e}")
-        print(traceback.format_exc())
+    except Exception:
+        logger.exception('Error generating description')
         return jsonify({'message': 'Failed to generate description'}), 500
 
 @ai_bp.route('/suggest-tasks', methods=['POST'])
@@ -45,7 +46,7 @@ def generate_description():
 def suggest_tasks():
     """Suggest tasks for an event using AI"""
     try:
-        current_user = get_current_user()
+        current_user = get_current_identity()
         if not current_user:
             return jsonify({'message': 'User not found'}), 404
         
@@ -67,9 +68,8 @@ def suggest_tasks():
         
         return jsonify({'tasks': tasks})
         
-    except Exception as e:
-        print(f"Error suggesting tasks: {e}")
-        print(traceback.format_exc())
+    except Exception:
+        logger.exception('Error suggesting tasks')
         return jsonify({'message': 'Failed to suggest tasks'}), 500
 
 @ai_bp.route('/generate-rsvp', methods=['POST'])
@@ -77,7 +77,7 @@ def suggest_tasks():
 def generate_rsvp():
     """Generate RSVP message using AI"""
     try:
-        current_user = get_current_user()
+        current_user = get_current_identity()
         if not current_user:
             return jsonify({'message': 'User not found'}), 404
         
@@ -97,9 +97,8 @@ def generate_rsvp():
         
         return jsonify({'message': message})
         
-    except Exception as e:
-        print(f"Error generating RSVP: {e}")
-        print(traceback.format_exc())
+    except Exception:
+        logger.exception('Error generating RSVP')
         return jsonify({'message': 'Failed to generate RSVP message'}), 500
 
 @ai_bp.route('/chat', methods=['POST'])
@@ -107,7 +106,7 @@ def generate_rsvp():
 def chat_assistant():
     """Interactive event planning chat assistant"""
     try:
-        current_user = get_current_user()
+        current_user = get_current_identity()
         if not current_user:
             return jsonify({'message': 'User not found'}), 404
         
@@ -142,9 +141,8 @@ def chat_assistant():
         
         return jsonify({'response': response})
         
-    except Exception as e:
-        print(f"Error in chat assistant: {e}")
-        print(traceback.format_exc())
+    except Exception:
+        logger.exception('Error in chat assistant')
         return jsonify({'message': 'Failed to get assistant response'}), 500
 
 @ai_bp.route('/optimize-timing', methods=['POST'])
@@ -152,7 +150,7 @@ def chat_assistant():
 def optimize_timing():
     """Get timing optimization suggestions for an event"""
     try:
-        current_user = get_current_user()
+        current_user = get_current_identity()
         if not current_user:
             return jsonify({'message': 'User not found'}), 404
         
@@ -166,8 +164,7 @@ def optimize_timing():
         
         return jsonify({'suggestions': suggestions})
         
-    except Exception as e:
-        print(f"Error optimizing timing: {e}")
-        print(traceback.format_exc())
+    except Exception:
+        logger.exception('Error optimizing timing')
         return jsonify({'message': 'Failed to optimize timing'}), 500
         
\ No newline at end of file
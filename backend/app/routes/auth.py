@@ -1,9 +1,12 @@
 # backend/app/routes/auth.py
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token
 from app import db
 from app.models import User
-import traceback
+from app.passwords import PasswordHashingBusy
+from app.utils import access_token_for, invalidate_user
+import logging
+
+logger = logging.getLogger(__name__)
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -25,15 +28,13 @@ def test_db():
             'password_hash_column_length': password_hash_col['type'].length if password_hash_col else 'Unknown'
         })
     except Exception as e:
-        print(f"Database test error: {e}")
+        logger.exception('Database test failed')
         return jsonify({'message': 'Database error', 'error': str(e)}), 500
 
 @auth_bp.route('/register', methods=['POST'])
 def register():
     try:
-        print("Registration attempt started")
         data = request.get_json()
-        print(f"Received data: {data}")
         
         if not data:
             return jsonify({'message': 'No data provided'}), 400
@@ -41,35 +42,31 @@ def register():
         if 'username' not in data or 'email' not in data or 'password' not in data:
             return jsonify({'message': 'Missing required fields'}), 400
         
-        print(f"Checking if username {data['username']} exists...")
         existing_user = User.query.filter_by(username=data['username']).first()
         if existing_user:
             return jsonify({'message': 'Username already exists'}), 400
         
-        print(f"Checking if email {data['email']} exists...")
         existing_email = User.query.filter_by(email=data['email']).first()
         if existing_email:
             return jsonify({'message': 'Email already exists'}), 400
         
-        print("Creating new user...")
         user = User(username=data['username'], email=data['email'])
         user.set_password(data['password'])
         
-        print("Adding user to database...")
         db.session.add(user)
         db.session.commit()
-        print("User created successfully")
+        logger.info('User registered', extra={'user_id': user.id})
         
-        # Convert user ID to string for JWT
-        access_token = create_access_token(identity=str(user.id))
+        access_token = access_token_for(user)
         return jsonify({
             'access_token': access_token,
             'user': user.to_dict()
         }), 201
         
+    except PasswordHashingBusy:
+        raise
     except Exception as e:
-        print(f"Error in register: {e}")
-        print(traceback.format_exc())
+        logger.exception('Registration failed')
         db.session.rollback()
         return jsonify({'message': 'Internal server error', 'error': str(e)}), 500
 
@@ -87,8 +84,12 @@ def login():
         user = User.query.filter_by(username=data['username']).first()
         
         if user and user.check_password(data['password']):
-            # Convert user ID to string for JWT
-            access_token = create_access_token(identity=str(user.id))
+            if user.password_needs_rehash():
+                # Move the stored hash to the current PASSWORD_HASH_METHOD
+                user.set_password(data['password'])
+                db.session.commit()
+                invalidate_user(user.id)
+            access_token = access_token_for(user)
             return jsonify({
                 'access_token': access_token,
                 'user': user.to_dict()
@@ -96,8 +97,9 @@ def login():
         
         return jsonify({'message': 'Invalid credentials'}), 401
         
+    except PasswordHashingBusy:
+        raise
     except Exception as e:
-        print(f"Error in login: {e}")
-        print(traceback.format_exc())
+        logger.exception('Login failed')
         return jsonify({'message': 'Internal server error', 'error': str(e)}), 500
         
\ No newline at end of file
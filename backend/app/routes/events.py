@@ -1,67 +1,380 @@
 # backend/app/routes/events.py
-from flask import Blueprint, request, jsonify
-from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, stream_with_context, url_for
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, func, literal, or_, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
 from app import db
-from app.models import Event, User, Invite, Notification
-from app.utils import jwt_required_custom, get_current_user
+from app.models import Event, EventOccurrence, User, Invite, serialization_options, select_fields
+from app.utils import (
+    jwt_required_custom, load_current_user, get_current_identity, keyset_page, paginated_response, parse_fieldset, parse_event_date,
+    get_page_limit, decode_cursor
+)
+from app.versioning import bump_users, bump_event, make_etag, not_modified, with_etag, user_version
+from app.services.search import index_events, unindex_events, search_terms, ranked_matches
+from app.services.ical import make_feed_token, read_feed_token, feed_token_matches, calendar
+from app.services.event_import import detect_format, read_rows, import_events, ImportFormatError
+from app.services.changes import record_change, record_changes, invite_changes, record_event_shared, record_event_deleted
+from app.services.notifications import notify, notify_many
+from app.services.recurrence import (
+    occurrences, is_occurrence, set_rule, active_series, expand, occurrence_dict, merge_page
+)
 
 events_bp = Blueprint('events', __name__)
 
+# Keys /invited adds to each event, selectable with ?fields=
+INVITE_FIELDS = ('invite_status', 'invite_message', 'invite_id', 'invited_at')
+
+# Longest window /range serves in one request
+MAX_RANGE = timedelta(days=366)
+
+# Most emails one bulk invite request accepts
+MAX_BULK_INVITES = 500
+
+# Rows fetched per round trip while streaming the iCalendar feed
+FEED_BATCH_SIZE = 200
+
+# How far ahead (or back) recurring events are expanded without ?until= (?since=)
+RECURRENCE_HORIZON = timedelta(days=90)
+
+def next_event_date(user_id, now):
+    """
+    Date of the user's next upcoming event or occurrence. The upcoming/past
+    split moves with the clock rather than with a write, so it is part of
+    their ETags.
+    """
+    dates = [db.session.query(func.min(Event.date)).filter(
+        Event.user_id == user_id,
+        Event.recurrence_rule.is_(None),
+        Event.date >= now
+    ).scalar()]
+    series = active_series(
+        db.session.query(Event.date, Event.recurrence_rule).filter(Event.user_id == user_id),
+        now, datetime.max
+    )
+    for date, rule in series:
+        dates.append(next(occurrences(date, rule, now, datetime.max), None))
+    return min((date for date in dates if date), default=None)
+
+def recurrence_window(now, past=False):
+    """
+    The span recurring events are expanded over: [?since=, now) for past
+    events and [now, ?until=) for upcoming ones. The defaults are whole days
+    so that responses stay cacheable for the rest of the day.
+    """
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if past:
+        since = request.args.get('since')
+        start = parse_range_bound(since) if since else today - RECURRENCE_HORIZON
+        if now - start > MAX_RANGE:
+            raise ValueError(f'since cannot be more than {MAX_RANGE.days} days ago')
+        return start, now
+    until = request.args.get('until')
+    end = parse_range_bound(until) if until else today + RECURRENCE_HORIZON + timedelta(days=1)
+    if end - now > MAX_RANGE:
+        raise ValueError(f'until cannot be more than {MAX_RANGE.days} days ahead')
+    return now, end
+
+def owned_events_page(user_id, window_start, window_end, descending=False):
+    """
+    One page of the user's single events and recurring occurrences between
+    window_start and window_end. Single events are paged in the database;
+    recurring events are expanded over the window only.
+    """
+    fields, include = parse_fieldset(Event)
+    options = serialization_options(Event, fields, include, columns=['date', 'recurrence_rule'])
+    cursor = request.args.get('cursor')
+    cursor = decode_cursor(cursor) if cursor else None
+    
+    query = Event.query.options(*options).filter(
+        Event.user_id == user_id,
+        Event.recurrence_rule.is_(None)
+    )
+    query = query.filter(Event.date < window_end) if descending else query.filter(Event.date >= window_start)
+    events, next_cursor = keyset_page(query, Event.date, Event.id, descending=descending)
+    
+    series = active_series(Event.query.options(*options).filter(Event.user_id == user_id), window_start, window_end)
+    items, next_cursor = merge_page(
+        events, next_cursor is not None, expand(series.all(), window_start, window_end),
+        get_page_limit(), cursor, descending
+    )
+    return paginated_response([
+        occurrence_dict(event.to_dict(fields, include), occurrence) if occurrence else event.to_dict(fields, include)
+        for event, occurrence in items
+    ], next_cursor)
+
+def calendar_selects(user_id, columns):
+    """
+    SELECTs of ``columns`` plus the user's invite status for the events the
+    user owns and for those they are invited to, meant to be narrowed
+    further and combined with UNION ALL. Owned events are never repeated
+    in the invited half.
+    """
+    owned = select(*columns, Invite.status).outerjoin(Invite, and_(
+        Invite.event_id == Event.id,
+        Invite.invitee_id == user_id
+    )).where(Event.user_id == user_id)
+    invited = select(*columns, Invite.status).join(Invite, Invite.event_id == Event.id).where(
+        Invite.invitee_id == user_id,
+        Event.user_id != user_id
+    )
+    return owned, invited
+
+def parse_range_bound(value):
+    """Parse an ISO date/datetime query parameter into naive UTC, like Event.date"""
+    value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 @events_bp.route('', methods=['GET'])
 @jwt_required_custom
 def get_events():
-    current_user = get_current_user()
+    current_user = get_current_identity()
     if not current_user:
         return jsonify({'message': 'User not found'}), 404
     
-    events = Event.query.filter(
-        Event.user_id == current_user.id,
-        Event.date >= datetime.utcnow()
-    ).all()
-    return jsonify([event.to_dict() for event in events])
+    now = datetime.utcnow()
+    try:
+        window_start, window_end = recurrence_window(now)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    etag = make_etag(current_user.id, user_version(current_user.id), next_event_date(current_user.id, now), window_end)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    try:
+        response = owned_events_page(current_user.id, window_start, window_end)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    return with_etag(response, etag)
 
 @events_bp.route('/past', methods=['GET'])
 @jwt_required_custom
 def get_past_events():
-    current_user = get_current_user()
+    current_user = get_current_identity()
     if not current_user:
         return jsonify({'message': 'User not found'}), 404
     
-    events = Event.query.filter(
-        Event.user_id == current_user.id,
-        Event.date < datetime.utcnow()
-    ).all()
-    return jsonify([event.to_dict() for event in events])
+    now = datetime.utcnow()
+    try:
+        window_start, window_end = recurrence_window(now, past=True)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    etag = make_etag(current_user.id, user_version(current_user.id), next_event_date(current_user.id, now), window_start)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    try:
+        # Most recent past events first
+        response = owned_events_page(current_user.id, window_start, window_end, descending=True)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    return with_etag(response, etag)
 
 @events_bp.route('/invited', methods=['GET'])
 @jwt_required_custom
 def get_invited_events():
     """Get events the current user has been invited to"""
-    current_user = get_current_user()
+    current_user = get_current_identity()
     if not current_user:
         return jsonify({'message': 'User not found'}), 404
     
-    # Get all invites for the current user
-    invites = Invite.query.filter_by(invitee_id=current_user.id).all()
+    etag = make_etag(current_user.id, user_version(current_user.id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    try:
+        fields, include = parse_fieldset(Event, extra_fields=INVITE_FIELDS)
+        event_fields = None if fields is None else fields - set(INVITE_FIELDS)
+        # Get the current user's invites together with their events, ordered by event date
+        query = db.session.query(Invite, Event).join(Event, Invite.event_id == Event.id).options(
+            *serialization_options(Event, event_fields, include, columns=['date'])
+        ).filter(Invite.invitee_id == current_user.id)
+        rows, next_cursor = keyset_page(
+            query, Event.date, Event.id,
+            key=lambda row: (row.Event.date, row.Event.id)
+        )
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     
     # Get the events from those invites
     invited_events = []
-    for invite in invites:
-        event_data = invite.event.to_dict()
-        event_data['invite_status'] = invite.status
-        event_data['invite_message'] = invite.message
-        event_data['invite_id'] = invite.id
-        event_data['invited_at'] = invite.created_at.isoformat()
+    for invite, event in rows:
+        event_data = event.to_dict(event_fields, include)
+        event_data.update(select_fields({
+            'invite_status': lambda: invite.status,
+            'invite_message': lambda: invite.message,
+            'invite_id': lambda: invite.id,
+            'invited_at': lambda: invite.created_at.isoformat()
+        }, fields))
         invited_events.append(event_data)
     
-    return jsonify(invited_events)
+    return with_etag(paginated_response(invited_events, next_cursor), etag)
+
+@events_bp.route('/search', methods=['GET'])
+@jwt_required_custom
+def search_events():
+    """Full-text search over the title, description and location of owned and invited events"""
+    current_user = get_current_identity()
+    if not current_user:
+        return jsonify({'message': 'User not found'}), 404
+    
+    terms = search_terms(request.args.get('q'))
+    if not terms:
+        return jsonify({'message': 'Search query is required'}), 400
+    
+    etag = make_etag(current_user.id, user_version(current_user.id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    try:
+        fields, include = parse_fieldset(Event)
+        matches = ranked_matches(terms)
+        invited = select(Invite.event_id).where(Invite.invitee_id == current_user.id)
+        query = db.session.query(Event, matches.c.rank).join(matches, matches.c.id == Event.id).options(
+            *serialization_options(Event, fields, include)
+        ).filter(or_(Event.user_id == current_user.id, Event.id.in_(invited)))
+        # Best matches first
+        rows, next_cursor = keyset_page(
+            query, matches.c.rank, Event.id,
+            key=lambda row: (row.rank, row.Event.id),
+            parse=float
+        )
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    return with_etag(paginated_response([event.to_dict(fields, include) for event, rank in rows], next_cursor), etag)
+
+@events_bp.route('/range', methods=['GET'])
+@jwt_required_custom
+def get_events_in_range():
+    """Owned and invited events with start <= date < end, in a compact form for calendar views"""
+    current_user = get_current_identity()
+    if not current_user:
+        return jsonify({'message': 'User not found'}), 404
+    
+    if not request.args.get('start') or not request.args.get('end'):
+        return jsonify({'message': 'start and end are required'}), 400
+    try:
+        start = parse_range_bound(request.args['start'])
+        end = parse_range_bound(request.args['end'])
+    except ValueError as e:
+        return jsonify({'message': f'Invalid date format: {str(e)}'}), 400
+    if end <= start:
+        return jsonify({'message': 'end must be after start'}), 400
+    if end - start > MAX_RANGE:
+        return jsonify({'message': f'Range cannot exceed {MAX_RANGE.days} days'}), 400
+    
+    etag = make_etag(current_user.id, user_version(current_user.id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    # Owned events come from ix_event_user_id_date and invited ones through
+    # ix_invite_invitee_id, so the cost follows this user's events only
+    columns = (Event.id, Event.title, Event.date, Event.location, Event.user_id, Event.recurrence_rule)
+    owned, invited = calendar_selects(current_user.id, columns)
+    single = union_all(*[
+        query.where(Event.recurrence_rule.is_(None), Event.date >= start, Event.date < end)
+        for query in (owned, invited)
+    ]).subquery()
+    rows = db.session.execute(select(single).order_by(single.c.date, single.c.id)).all()
+    # Recurring events are expanded over the requested range only
+    series = db.session.execute(union_all(*[active_series(query, start, end) for query in (owned, invited)])).all()
+    expanded = expand(list({row.id: row for row in series}.values()), start, end)
+    
+    events = []
+    seen = set()
+    for event_id, title, date, location, user_id, rule, invite_status in rows:
+        if event_id in seen:
+            continue
+        seen.add(event_id)
+        events.append({
+            'id': event_id,
+            'title': title,
+            'date': date.isoformat(),
+            'location': location,
+            'owned': user_id == current_user.id,
+            'invite_status': invite_status
+        })
+    for occurrence in expanded:
+        row = occurrence.event
+        events.append(occurrence_dict({
+            'id': row.id,
+            'title': row.title,
+            'date': None,
+            'location': row.location,
+            'owned': row.user_id == current_user.id,
+            'invite_status': row.status
+        }, occurrence))
+    events.sort(key=lambda event: (event['date'], event['id']))
+    
+    return with_etag(jsonify(events), etag)
+
+@events_bp.route('/feed-token', methods=['GET'])
+@jwt_required_custom
+def get_feed_token():
+    """Calendar subscription URL for the current user's events"""
+    # Not the cached user: the token is derived from credentials another
+    # worker may have just changed
+    current_user = load_current_user()
+    if not current_user:
+        return jsonify({'message': 'User not found'}), 404
+    
+    token = make_feed_token(current_user)
+    return jsonify({'token': token, 'url': url_for('events.get_feed', token=token, _external=True)})
+
+@events_bp.route('/feed.ics', methods=['GET'])
+def get_feed():
+    """iCalendar feed of owned and invited events, authenticated by ?token= for calendar apps"""
+    claims = read_feed_token(request.args.get('token', ''))
+    user = User.query.get(claims[0]) if claims else None
+    if not claims or not feed_token_matches(user, claims[1]):
+        return jsonify({'message': 'Invalid feed token'}), 401
+    
+    # Calendar apps poll often; unchanged feeds cost one primary key lookup
+    etag = make_etag(user.id, user.data_version)
+    last_modified = user.data_updated_at or user.created_at
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+    
+    columns = (Event.id, Event.title, Event.description, Event.date, Event.location, Event.created_at)
+    owned = select(*columns, literal(None).label('invite_status'), Event.recurrence_rule).where(Event.user_id == user.id)
+    invited = select(*columns, Invite.status, Event.recurrence_rule).join(Invite, Invite.event_id == Event.id).where(
+        Invite.invitee_id == user.id,
+        Invite.status != 'declined',
+        Event.user_id != user.id
+    )
+    # Cancelled and edited occurrences of the feed's recurring events, in one query
+    series = union_all(*[
+        query.with_only_columns(Event.id).where(Event.recurrence_rule.isnot(None))
+        for query in (owned, invited)
+    ])
+    overrides = {}
+    for override in EventOccurrence.query.filter(EventOccurrence.event_id.in_(series)):
+        overrides.setdefault(override.event_id, []).append(override)
+    rows = db.session.execute(union_all(owned, invited).execution_options(yield_per=FEED_BATCH_SIZE))
+    
+    response = Response(
+        stream_with_context(calendar(rows, f"{user.username}'s events", overrides)),
+        mimetype='text/calendar'
+    )
+    response.headers['Content-Disposition'] = 'inline; filename="events.ics"'
+    return with_etag(response, etag, last_modified)
 
 @events_bp.route('', methods=['POST'])
 @jwt_required_custom
 def create_event():
     try:
         data = request.get_json()
-        current_user = get_current_user()
+        current_user = get_current_identity()
         
         if not current_user:
             return jsonify({'message': 'User not found'}), 404
@@ -74,17 +387,7 @@ def create_event():
         
         # Parse date with better error handling
         try:
-            date_str = data['date']
-            # Handle different date formats
-            if 'T' in date_str and not date_str.endswith('Z'):
-                # datetime-local format from HTML input
-                event_date = datetime.fromisoformat(date_str)
-            elif date_str.endswith('Z'):
-                # ISO format with Z
-                event_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            else:
-                # Try parsing as-is
-                event_date = datetime.fromisoformat(date_str)
+            event_date = parse_event_date(data['date'])
         except (ValueError, TypeError) as e:
             return jsonify({'message': f'Invalid date format: {str(e)}'}), 400
         
@@ -95,8 +398,16 @@ def create_event():
             location=data.get('location'),
             user_id=current_user.id
         )
+        try:
+            set_rule(event, data.get('recurrence_rule'))
+        except ValueError as e:
+            return jsonify({'message': f'Invalid recurrence rule: {str(e)}'}), 400
         
         db.session.add(event)
+        db.session.flush()
+        index_events([event.id])
+        record_change('events', event.id, 'insert', event_id=event.id)
+        bump_users(current_user.id)
         db.session.commit()
         
         return jsonify(event.to_dict()), 201
@@ -105,11 +416,52 @@ def create_event():
         return jsonify({'message': f'Error creating event: {str(e)}'}), 500
 
 
+@events_bp.route('/import', methods=['POST'])
+@jwt_required_custom
+def import_events_upload():
+    """Bulk create events from a CSV or JSON-lines upload (multipart 'file' field or raw body)"""
+    current_user = get_current_identity()
+    if not current_user:
+        return jsonify({'message': 'User not found'}), 404
+    
+    upload = request.files.get('file')
+    try:
+        if upload:
+            fmt = detect_format(upload.filename, upload.mimetype)
+            stream = upload.stream
+        else:
+            fmt = detect_format(None, request.mimetype)
+            stream = request.stream
+    except ImportFormatError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    try:
+        # All valid rows land in one transaction
+        imported, failed, errors = import_events(read_rows(stream, fmt), current_user.id)
+        if imported:
+            bump_users(current_user.id)
+        db.session.commit()
+    except UnicodeDecodeError:
+        db.session.rollback()
+        return jsonify({'message': 'Upload must be UTF-8 encoded'}), 400
+    except ImportFormatError as e:
+        db.session.rollback()
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': f'Error importing events: {str(e)}'}), 500
+    
+    return jsonify({
+        'imported': imported,
+        'failed': failed,
+        'errors': errors
+    }), 201 if imported else 200
+
 @events_bp.route('/<int:event_id>/invite', methods=['POST'])
 @jwt_required_custom
 def send_invite(event_id):
     data = request.get_json()
-    current_user = get_current_user()
+    current_user = get_current_identity()
 
     if not data.get('email'):
         return jsonify({'message': 'Email is required'}), 400
@@ -131,29 +483,125 @@ def send_invite(event_id):
     )
 
     db.session.add(invite)
-    db.session.commit()
-
-    notification = Notification(
-        user_id=invitee.id,
-        type='invite',
-        title=f'You are invited to {invite.event.title}',
-        message=invite.message or '',
+    db.session.flush()
+    record_changes(invite_changes(invite.id, event_id, invitee.id, current_user.id, 'insert'))
+    record_event_shared(event_id, [invitee.id])
+    notify(
+        invitee.id,
+        'invite',
+        f'You are invited to {invite.event.title}',
+        invite.message or '',
         related_id=invite.id
     )
-
-    db.session.add(notification)
+    bump_users(invitee.id, current_user.id)
     db.session.commit()
 
     return jsonify(invite.to_dict()), 201
 
+@events_bp.route('/<int:event_id>/invites/bulk', methods=['POST'])
+@jwt_required_custom
+def send_bulk_invites(event_id):
+    """Invite a list of emails at once, reporting a result per email"""
+    event = Event.query.get_or_404(event_id)
+    current_user = get_current_identity()
+    
+    if event.user_id != current_user.id:
+        return jsonify({'message': 'Unauthorized'}), 403
+    
+    data = request.get_json() or {}
+    emails = data.get('emails')
+    if not isinstance(emails, list) or not emails:
+        return jsonify({'message': 'emails must be a non-empty list'}), 400
+    if len(emails) > MAX_BULK_INVITES:
+        return jsonify({'message': f'Cannot invite more than {MAX_BULK_INVITES} emails at once'}), 400
+    
+    # Keep the first occurrence of each email, in request order
+    requested = list(dict.fromkeys(email.strip() for email in emails if isinstance(email, str) and email.strip()))
+    if not requested:
+        return jsonify({'message': 'emails must be a non-empty list'}), 400
+    
+    try:
+        # One query resolves every email, one more finds the ones already invited
+        users = dict(db.session.query(User.email, User.id).filter(User.email.in_(requested)).all())
+        already_invited = set(db.session.scalars(
+            select(Invite.invitee_email).where(Invite.event_id == event.id, Invite.invitee_email.in_(requested))
+        ))
+        
+        results = []
+        invites = []
+        for email in requested:
+            if email in already_invited:
+                results.append({'email': email, 'status': 'already_invited'})
+            elif email not in users:
+                results.append({'email': email, 'status': 'no_user'})
+            else:
+                invites.append({
+                    'event_id': event.id,
+                    'inviter_id': current_user.id,
+                    'invitee_email': email,
+                    'invitee_id': users[email],
+                    'status': 'pending',
+                    'message': data.get('message'),
+                    'created_at': datetime.utcnow()
+                })
+                results.append({'email': email, 'status': 'invited'})
+        
+        if invites:
+            # Multi-row INSERTs and one commit; ids are matched back by email,
+            # which is unique per event, so row order does not matter. Emails
+            # a concurrent request invited in the meantime come back without
+            # an id and are reported as already invited
+            dialect = postgresql if db.session.get_bind().dialect.name == 'postgresql' else sqlite
+            invite_ids = dict(db.session.execute(
+                dialect.insert(Invite).on_conflict_do_nothing(
+                    index_elements=['event_id', 'invitee_email']
+                ).returning(Invite.invitee_email, Invite.id),
+                invites
+            ).all())
+            invites = [invite for invite in invites if invite['invitee_email'] in invite_ids]
+            for result in results:
+                if result['status'] == 'invited' and result['email'] not in invite_ids:
+                    result['status'] = 'already_invited'
+        
+        if invites:
+            record_changes([
+                change
+                for invite in invites
+                for change in invite_changes(invite_ids[invite['invitee_email']], event.id, invite['invitee_id'], current_user.id, 'insert')
+            ])
+            record_event_shared(event.id, [invite['invitee_id'] for invite in invites])
+            notify_many([{
+                'user_id': invite['invitee_id'],
+                'type': 'invite',
+                'title': f'You are invited to {event.title}',
+                'message': invite['message'] or '',
+                'related_id': invite_ids[invite['invitee_email']]
+            } for invite in invites])
+            bump_users(current_user.id, *[invite['invitee_id'] for invite in invites])
+            db.session.commit()
+            
+            for result in results:
+                if result['status'] == 'invited':
+                    result['invite_id'] = invite_ids[result['email']]
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': f'Error sending invites: {str(e)}'}), 500
+    
+    return jsonify({'invited': len(invites), 'results': results}), 201 if invites else 200
+
 @events_bp.route('/<int:event_id>', methods=['GET'])
 @jwt_required_custom
 def get_event(event_id):
-    current_user = get_current_user()
+    current_user = get_current_identity()
     if not current_user:
         return jsonify({'message': 'User not found'}), 404
     
-    event = Event.query.get_or_404(event_id)
+    try:
+        fields, include = parse_fieldset(Event)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    event = Event.query.options(*serialization_options(Event, fields, include, columns=['user_id', 'version'])).get_or_404(event_id)
     
     # Check if user is the creator OR has been invited to this event
     if event.user_id != current_user.id:
@@ -164,13 +612,18 @@ def get_event(event_id):
         if not invite:
             return jsonify({'message': 'Unauthorized - you are not invited to this event'}), 403
     
-    return jsonify(event.to_dict())
+    etag = make_etag(event.id, event.version)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    return with_etag(jsonify(event.to_dict(fields, include)), etag)
 
 @events_bp.route('/<int:event_id>', methods=['PUT'])
 @jwt_required_custom
 def update_event(event_id):
     event = Event.query.get_or_404(event_id)
-    current_user = get_current_user()
+    current_user = get_current_identity()
     
     if event.user_id != current_user.id:
         return jsonify({'message': 'Unauthorized'}), 403
@@ -180,22 +633,25 @@ def update_event(event_id):
     event.description = data.get('description', event.description)
     event.location = data.get('location', event.location)
     
+    schedule = (event.date, event.recurrence_rule)
     if 'date' in data:
         try:
-            date_str = data['date']
-            # Handle different date formats
-            if 'T' in date_str and not date_str.endswith('Z'):
-                # datetime-local format from HTML input
-                event.date = datetime.fromisoformat(date_str)
-            elif date_str.endswith('Z'):
-                # ISO format with Z
-                event.date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            else:
-                # Try parsing as-is
-                event.date = datetime.fromisoformat(date_str)
+            event.date = parse_event_date(data['date'])
         except (ValueError, TypeError):
             return jsonify({'message': 'Invalid date format'}), 400
     
+    try:
+        set_rule(event, data.get('recurrence_rule', event.recurrence_rule))
+    except ValueError as e:
+        return jsonify({'message': f'Invalid recurrence rule: {str(e)}'}), 400
+    if (event.date, event.recurrence_rule) != schedule:
+        # Overrides are keyed by the old schedule's dates
+        EventOccurrence.query.filter_by(event_id=event.id).delete()
+    
+    db.session.flush()
+    index_events([event.id])
+    record_change('events', event.id, 'update', event_id=event.id)
+    bump_event(event.id)
     db.session.commit()
     return jsonify(event.to_dict())
 
@@ -203,12 +659,79 @@ def update_event(event_id):
 @jwt_required_custom
 def delete_event(event_id):
     event = Event.query.get_or_404(event_id)
-    current_user = get_current_user()
+    current_user = get_current_identity()
     
     if event.user_id != current_user.id:
         return jsonify({'message': 'Unauthorized'}), 403
     
+    bump_event(event.id)
+    unindex_events([event.id])
+    record_event_deleted(event.id)
     db.session.delete(event)
     db.session.commit()
     
     return jsonify({'message': 'Event deleted'}), 200
+
+def get_occurrence_target(event_id, original_date):
+    """Owned recurring event and parsed occurrence start for the override routes, or an error response"""
+    event = Event.query.get_or_404(event_id)
+    current_user = get_current_identity()
+    
+    if event.user_id != current_user.id:
+        return None, None, (jsonify({'message': 'Unauthorized'}), 403)
+    if not event.recurrence_rule:
+        return None, None, (jsonify({'message': 'Event is not recurring'}), 400)
+    try:
+        original_date = parse_range_bound(original_date)
+    except ValueError as e:
+        return None, None, (jsonify({'message': f'Invalid date format: {str(e)}'}), 400)
+    if not is_occurrence(event.date, event.recurrence_rule, original_date):
+        return None, None, (jsonify({'message': 'No occurrence at that date'}), 404)
+    return event, original_date, None
+
+@events_bp.route('/<int:event_id>/occurrences/<original_date>', methods=['PUT'])
+@jwt_required_custom
+def update_occurrence(event_id, original_date):
+    """Cancel, move or retitle one occurrence of a recurring event"""
+    event, original_date, error = get_occurrence_target(event_id, original_date)
+    if error:
+        return error
+    
+    data = request.get_json() or {}
+    override = EventOccurrence.query.filter_by(event_id=event.id, original_date=original_date).first()
+    if not override:
+        override = EventOccurrence(event_id=event.id, original_date=original_date)
+        db.session.add(override)
+    
+    override.cancelled = bool(data.get('cancelled', override.cancelled))
+    override.title = data.get('title', override.title)
+    override.description = data.get('description', override.description)
+    override.location = data.get('location', override.location)
+    if 'date' in data:
+        try:
+            override.date = parse_event_date(data['date']) if data['date'] else None
+        except (ValueError, TypeError):
+            return jsonify({'message': 'Invalid date format'}), 400
+    
+    record_change('events', event.id, 'update', event_id=event.id)
+    bump_event(event.id)
+    db.session.commit()
+    return jsonify(override.to_dict())
+
+@events_bp.route('/<int:event_id>/occurrences/<original_date>', methods=['DELETE'])
+@jwt_required_custom
+def reset_occurrence(event_id, original_date):
+    """Drop an occurrence's override so it follows the series again"""
+    event, original_date, error = get_occurrence_target(event_id, original_date)
+    if error:
+        return error
+    
+    override = EventOccurrence.query.filter_by(event_id=event.id, original_date=original_date).first()
+    if not override:
+        return jsonify({'message': 'Occurrence has no changes'}), 404
+    
+    db.session.delete(override)
+    record_change('events', event.id, 'update', event_id=event.id)
+    bump_event(event.id)
+    db.session.commit()
+    return jsonify({'message': 'Occurrence reset'}), 200
@@ -1,9 +1,13 @@
 # backend/app/routes/invites.py
 from flask import Blueprint, request, jsonify
 from datetime import datetime
+from sqlalchemy import func
 from app import db
-from app.models import Invite, User, Event, Notification
-from app.utils import jwt_required_custom, get_current_user
+from app.models import Invite, User, Event, serialization_options
+from app.utils import jwt_required_custom, get_current_identity, parse_fieldset, keyset_page, paginated_response
+from app.versioning import bump_users, make_etag, not_modified, with_etag, user_version
+from app.services.changes import record_changes, invite_changes
+from app.services.notifications import notify
 
 invites_bp = Blueprint('invites', __name__)
 
@@ -11,15 +15,28 @@ invites_bp = Blueprint('invites', __name__)
 @jwt_required_custom
 def get_user_invites():
     """Get all invites for the current user"""
-    current_user = get_current_user()
-    invites = Invite.query.filter_by(invitee_id=current_user.id).all()
-    return jsonify([invite.to_dict() for invite in invites])
+    current_user = get_current_identity()
+    
+    etag = make_etag(current_user.id, user_version(current_user.id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    try:
+        fields, include = parse_fieldset(Invite)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    invites = Invite.query.options(
+        *serialization_options(Invite, fields, include)
+    ).filter_by(invitee_id=current_user.id).all()
+    return with_etag(jsonify([invite.to_dict(fields, include) for invite in invites]), etag)
 
 @invites_bp.route('/<int:invite_id>/respond', methods=['POST'])
 @jwt_required_custom
 def respond_to_invite(invite_id):
     """Respond to an invitation (accept/decline)"""
-    current_user = get_current_user()
+    current_user = get_current_identity()
     invite = Invite.query.get_or_404(invite_id)
     
     if invite.invitee_id != current_user.id:
@@ -35,19 +52,17 @@ def respond_to_invite(invite_id):
     invite.status = status
     invite.message = response_message
     invite.responded_at = datetime.utcnow()
+    record_changes(invite_changes(invite.id, invite.event_id, invite.invitee_id, invite.inviter_id, 'update'))
     
-    db.session.commit()
-    
-    # Create notification for the inviter
-    notification = Notification(
-        user_id=invite.inviter_id,
-        type='invite_response',
-        title=f'{current_user.username} {status} your invite to {invite.event.title}',
-        message=response_message,
+    # Notify the inviter once the response is committed
+    notify(
+        invite.inviter_id,
+        'invite_response',
+        f'{current_user.username} {status} your invite to {invite.event.title}',
+        response_message,
         related_id=invite.id
     )
-    
-    db.session.add(notification)
+    bump_users(invite.invitee_id, invite.inviter_id)
     db.session.commit()
     
     return jsonify(invite.to_dict())
@@ -56,7 +71,7 @@ def respond_to_invite(invite_id):
 @jwt_required_custom
 def cancel_invite(invite_id):
     """Cancel an invitation"""
-    current_user = get_current_user()
+    current_user = get_current_identity()
     invite = Invite.query.get_or_404(invite_id)
     
     # Only the invitee can cancel their own invite
@@ -67,16 +82,15 @@ def cancel_invite(invite_id):
     if invite.status != 'pending':
         return jsonify({'message': 'Can only cancel pending invites'}), 400
     
-    # Create notification for the inviter
-    notification = Notification(
-        user_id=invite.inviter_id,
-        type='invite_cancelled',
-        title=f'{current_user.username} cancelled their invite to {invite.event.title}',
-        message='',
+    # Notify the inviter once the cancellation is committed
+    notify(
+        invite.inviter_id,
+        'invite_cancelled',
+        f'{current_user.username} cancelled their invite to {invite.event.title}',
         related_id=invite.id
     )
-    
-    db.session.add(notification)
+    record_changes(invite_changes(invite.id, invite.event_id, invite.invitee_id, invite.inviter_id, 'delete'))
+    bump_users(invite.invitee_id, invite.inviter_id)
     db.session.delete(invite)
     db.session.commit()
     
@@ -86,6 +100,72 @@ def cancel_invite(invite_id):
 @jwt_required_custom
 def get_sent_invites():
     """Get all invites sent by the current user"""
-    current_user = get_current_user()
-    invites = Invite.query.filter_by(inviter_id=current_user.id).all()
-    return jsonify([invite.to_dict() for invite in invites])
+    current_user = get_current_identity()
+    
+    etag = make_etag(current_user.id, user_version(current_user.id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    try:
+        fields, include = parse_fieldset(Invite)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    invites = Invite.query.options(
+        *serialization_options(Invite, fields, include)
+    ).filter_by(inviter_id=current_user.id).all()
+    return with_etag(jsonify([invite.to_dict(fields, include) for invite in invites]), etag)
+
+@invites_bp.route('/sent/summary', methods=['GET'])
+@jwt_required_custom
+def get_sent_invites_summary():
+    """Invite status counts for each event the current user has sent invites for"""
+    current_user = get_current_identity()
+    
+    etag = make_etag(current_user.id, user_version(current_user.id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    rows = db.session.query(
+        Invite.event_id, Event.title, Event.date, Invite.status, func.count()
+    ).join(Event, Invite.event_id == Event.id).filter(
+        Invite.inviter_id == current_user.id
+    ).group_by(Invite.event_id, Event.title, Event.date, Invite.status).order_by(Event.date, Invite.event_id).all()
+    
+    summary = {}
+    for event_id, title, date, status, count in rows:
+        event = summary.setdefault(event_id, {
+            'event_id': event_id,
+            'event_title': title,
+            'event_date': date.isoformat(),
+            'counts': {'pending': 0, 'accepted': 0, 'declined': 0},
+            'total': 0
+        })
+        event['counts'][status] = event['counts'].get(status, 0) + count
+        event['total'] += count
+    return with_etag(jsonify(list(summary.values())), etag)
+
+@invites_bp.route('/sent/event/<int:event_id>', methods=['GET'])
+@jwt_required_custom
+def get_sent_invites_for_event(event_id):
+    """Invites the current user sent for one event, oldest first, optionally filtered by ?status="""
+    current_user = get_current_identity()
+    
+    etag = make_etag(current_user.id, user_version(current_user.id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    try:
+        fields, include = parse_fieldset(Invite)
+        query = Invite.query.options(
+            *serialization_options(Invite, fields, include, columns=['created_at'])
+        ).filter_by(inviter_id=current_user.id, event_id=event_id)
+        if request.args.get('status'):
+            query = query.filter_by(status=request.args['status'])
+        invites, next_cursor = keyset_page(query, Invite.created_at, Invite.id)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    return with_etag(paginated_response([invite.to_dict(fields, include) for invite in invites], next_cursor), etag)
@@ -0,0 +1,101 @@
+# backend/app/routes/notifications.py
+import queue
+import time
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from app import db
+from app.utils import jwt_required_custom, get_current_user_id
+from app.services.notification_stream import (
+    broker, replay, format_event, make_stream_token, read_stream_token, TooManyStreams
+)
+
+notifications_bp = Blueprint('notifications', __name__)
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_INTERVAL = 15
+# Seconds clients wait before reconnecting, also sent as Retry-After when full
+STREAM_RETRY_AFTER = 3
+
+@notifications_bp.route('/stream-token', methods=['GET'])
+@jwt_required_custom
+def get_stream_token():
+    """
+    Short-lived token for ?token= on /stream. EventSource cannot send an
+    Authorization header, and a URL ends up in access logs, so the JWT
+    itself never goes there.
+    """
+    return jsonify({
+        'token': make_stream_token(get_current_user_id()),
+        'expires_in': current_app.config['NOTIFICATION_STREAM_TOKEN_SECONDS']
+    })
+
+@notifications_bp.route('/stream', methods=['GET'])
+def stream_notifications():
+    """Server-Sent Events stream of the current user's new notifications"""
+    if request.args.get('token'):
+        user_id = read_stream_token(request.args['token'])
+        if user_id is None:
+            return jsonify({'message': 'Invalid or expired stream token'}), 401
+    else:
+        try:
+            verify_jwt_in_request()
+            user_id = int(get_jwt_identity())
+        except Exception:
+            return jsonify({'message': 'Invalid or missing token'}), 401
+    
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+    try:
+        last_event_id = int(last_event_id) if last_event_id is not None else None
+    except ValueError:
+        return jsonify({'message': 'Last-Event-ID must be an integer'}), 400
+    
+    app = current_app._get_current_object()
+    max_seconds = app.config['NOTIFICATION_STREAM_MAX_SECONDS']
+    # Subscribe before replaying so nothing written in between is missed
+    try:
+        stream = broker.subscribe(app, user_id)
+    except TooManyStreams:
+        response = jsonify({'message': 'Too many open notification streams, please try again'})
+        response.headers['Retry-After'] = str(STREAM_RETRY_AFTER)
+        return response, 503
+    try:
+        missed = replay(user_id, last_event_id) if last_event_id is not None else []
+    except Exception:
+        broker.unsubscribe(user_id, stream)
+        raise
+    # The stream may stay open for minutes; don't hold a connection meanwhile
+    db.session.remove()
+    
+    def generate():
+        # Replay and the live queue overlap, and the tailer may deliver a
+        # late row out of order; each notification is sent once
+        delivered = set()
+        deadline = time.monotonic() + max_seconds
+        try:
+            yield f'retry: {STREAM_RETRY_AFTER * 1000}\n\n'
+            for cursor, data in missed:
+                delivered.add(data['id'])
+                yield format_event(cursor, data)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    item = stream.get(timeout=min(HEARTBEAT_INTERVAL, remaining))
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                if item is None:
+                    # Fell behind; the client reconnects and replays
+                    return
+                cursor, data = item
+                if data['id'] not in delivered:
+                    delivered.add(data['id'])
+                    yield format_event(cursor, data)
+        finally:
+            broker.unsubscribe(user_id, stream)
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
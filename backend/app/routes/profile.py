@@ -2,7 +2,9 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models import User
-from app.utils import jwt_required_custom, get_current_user
+from app.utils import jwt_required_custom, get_current_user, load_current_user, invalidate_user, access_token_for
+from app.versioning import bump_user_references
+from app.services.changes import record_change
 
 profile_bp = Blueprint('profile', __name__)
 
@@ -20,7 +22,7 @@ def get_profile():
 @jwt_required_custom
 def update_profile():
     """Update current user's profile information"""
-    current_user = get_current_user()
+    current_user = load_current_user()
     if not current_user:
         return jsonify({'message': 'User not found'}), 404
     
@@ -39,14 +41,23 @@ def update_profile():
             return jsonify({'message': 'Email already exists'}), 400
     
     # Update fields if provided
-    if 'username' in data:
+    renamed = 'username' in data and data['username'] != current_user.username
+    if renamed:
         current_user.username = data['username']
+        # Other users' lists show this username
+        bump_user_references(current_user.id)
     if 'email' in data:
         current_user.email = data['email']
+    record_change('users', current_user.id, 'update', user_id=current_user.id)
     
     try:
         db.session.commit()
-        return jsonify(current_user.to_dict())
+        invalidate_user(current_user.id)
+        response = jsonify(current_user.to_dict())
+        if renamed:
+            # The old token still carries the old username in its claims
+            response.headers['X-Access-Token'] = access_token_for(current_user)
+        return response
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': f'Error updating profile: {str(e)}'}), 500
@@ -55,13 +66,16 @@ def update_profile():
 @jwt_required_custom
 def delete_account():
     """Delete current user's account"""
-    current_user = get_current_user()
+    current_user = load_current_user()
     if not current_user:
         return jsonify({'message': 'User not found'}), 404
     
     try:
+        user_id = current_user.id
+        record_change('users', user_id, 'delete', user_id=user_id)
         db.session.delete(current_user)
         db.session.commit()
+        invalidate_user(user_id)
         return jsonify({'message': 'Account deleted successfully'})
     except Exception as e:
         db.session.rollback()
@@ -71,7 +85,7 @@ def delete_account():
 @jwt_required_custom
 def change_password():
     """Change user's password"""
-    current_user = get_current_user()
+    current_user = load_current_user()
     if not current_user:
         return jsonify({'message': 'User not found'}), 404
     
@@ -88,11 +102,13 @@ def change_password():
     if len(data['new_password']) < 6:
         return jsonify({'message': 'New password must be at least 6 characters long'}), 400
     
-    # Update password
+    # Update password; calendar feed URLs handed out so far stop working
     current_user.set_password(data['new_password'])
+    current_user.feed_token_version += 1
     
     try:
         db.session.commit()
+        invalidate_user(current_user.id)
         return jsonify({'message': 'Password updated successfully'})
     except Exception as e:
         db.session.rollback()
@@ -1,8 +1,13 @@
 # backend/app/routes/rsvps.py
 from flask import Blueprint, request, jsonify
+from sqlalchemy import and_, false, func, or_
 from app import db
-from app.models import RSVP, Event, Notification, Invite
-from app.utils import jwt_required_custom, get_current_user
+from app.models import RSVP, Event, Notification, Invite, serialization_options
+from app.utils import jwt_required_custom, get_current_identity, keyset_page, paginated_response, decode_cursor
+from app.versioning import bump_users, bump_event, make_etag, not_modified, with_etag, user_version
+from app.services.changes import record_change, record_query_changes
+from app.services.notifications import notify
+from app.services.rsvp_summary import rsvp_summary, invalidate as invalidate_rsvp_summary
 
 rsvps_bp = Blueprint('rsvps', __name__)
 
@@ -10,14 +15,39 @@ rsvps_bp = Blueprint('rsvps', __name__)
 @jwt_required_custom
 def get_event_rsvps(event_id):
     event = Event.query.get_or_404(event_id)
-    return jsonify([rsvp.to_dict() for rsvp in event.rsvps])
+    
+    etag = make_etag(event.id, event.version)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    rsvps = RSVP.query.options(*serialization_options(RSVP)).filter_by(event_id=event.id).all()
+    return with_etag(jsonify([rsvp.to_dict() for rsvp in rsvps]), etag)
+
+@rsvps_bp.route('/event/<int:event_id>/summary', methods=['GET'])
+@jwt_required_custom
+def get_event_rsvp_summary(event_id):
+    """Going / maybe / not going counts for an event card"""
+    version = db.session.query(Event.version).filter_by(id=event_id).scalar()
+    if version is None:
+        return jsonify({'message': 'Event not found'}), 404
+    
+    etag = make_etag(event_id, version)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    return with_etag(jsonify(rsvp_summary(event_id, version)), etag)
 
-@rsvps_bp.route('/event/cint:event_ide', methods=['POST'])
+@rsvps_bp.route('/event/<int:event_id>', methods=['POST'])
 @jwt_required_custom
 def create_rsvp(event_id):
-    current_user = get_current_user()
+    current_user = get_current_identity()
     event = Event.query.get_or_404(event_id)
-    data = request.get_json()
+    data = request.get_json() or {}
+    
+    if data.get('status') not in RSVP.STATUSES:
+        return jsonify({'message': f'Status must be one of: {", ".join(RSVP.STATUSES)}'}), 400
     
     # Check if user is the creator OR has been invited to this event
     if event.user_id != current_user.id:
@@ -28,66 +58,115 @@ def create_rsvp(event_id):
         if not invite:
             return jsonify({'message': 'Unauthorized - you are not invited to this event'}), 403
     
-    existing_rsvp = RSVP.query.filter_by(user_id=current_user.id, event_id=event_id).first()
-    
-    if existing_rsvp:
-        existing_rsvp.status = data['status']
-        existing_rsvp.message = data.get('message')
-        db.session.commit()
+    try:
+        rsvp_id, created = RSVP.upsert(current_user.id, event_id, data['status'], data.get('message'))
+        if created:
+            Event.adjust_count(event_id, Event.rsvps_count, 1)
+        record_change('rsvps', rsvp_id, 'insert' if created else 'update', event_id=event_id)
         
-        # Create notification for event creator if RSVP is from an invited user
+        # Notify the event creator if RSVP is from an invited user
         if event.user_id != current_user.id:
-            notification = Notification(
-                user_id=event.user_id,
-                type='rsvp_update',
-                title=f'{current_user.username} updated their RSVP to {event.title}',
-                message=f'Status: {data["status"]}. {data.get("message", "")}',
-                related_id=event_id
+            notify(
+                event.user_id,
+                'rsvp_new' if created else 'rsvp_update',
+                f'{current_user.username} RSVP\'d to {event.title}' if created
+                else f'{current_user.username} updated their RSVP to {event.title}',
+                f'Status: {data["status"]}. {data.get("message", "")}',
+                related_id=event_id,
+                merged_title=f'{{count}} new RSVPs for {event.title}' if created
+                else f'{{count}} RSVP updates for {event.title}'
             )
-            db.session.add(notification)
-            db.session.commit()
-        
-        return jsonify(existing_rsvp.to_dict())
-    
-    rsvp = RSVP(
-        user_id=current_user.id,
-        event_id=event_id,
-        status=data['status'],
-        message=data.get('message')
-    )
-    
-    db.session.add(rsvp)
-    db.session.commit()
-    
-    # Create notification for event creator if RSVP is from an invited user
-    if event.user_id != current_user.id:
-        notification = Notification(
-            user_id=event.user_id,
-            type='rsvp_new',
-            title=f'{current_user.username} RSVP\'d to {event.title}',
-            message=f'Status: {data["status"]}. {data.get("message", "")}',
-            related_id=event_id
-        )
-        db.session.add(notification)
+        bump_event(event_id)
         db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': f'Error saving RSVP: {str(e)}'}), 500
+    invalidate_rsvp_summary(event_id)
     
-    return jsonify(rsvp.to_dict()), 201
+    rsvp = db.session.get(RSVP, rsvp_id, populate_existing=True)
+    return jsonify(rsvp.to_dict()), 201 if created else 200
 
 
 @rsvps_bp.route('/notifications', methods=['GET'])
 @jwt_required_custom
 def get_notifications():
-    current_user = get_current_user()
-    notifications = Notification.query.filter_by(user_id=current_user.id).order_by(Notification.created_at.desc()).all()
-    return jsonify([notification.to_dict() for notification in notifications])
+    current_user = get_current_identity()
+    
+    etag = make_etag(current_user.id, user_version(current_user.id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    try:
+        # Newest first
+        notifications, next_cursor = keyset_page(
+            Notification.query.filter_by(user_id=current_user.id),
+            Notification.created_at, Notification.id, descending=True
+        )
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    return with_etag(paginated_response([notification.to_dict() for notification in notifications], next_cursor), etag)
+
+@rsvps_bp.route('/notifications/unread-count', methods=['GET'])
+@jwt_required_custom
+def get_unread_notification_count():
+    """Number of unread notifications, counted from the partial unread index"""
+    current_user = get_current_identity()
+    
+    count = db.session.query(func.count()).select_from(Notification).filter(
+        Notification.user_id == current_user.id,
+        Notification.read == false()
+    ).scalar()
+    return jsonify({'count': count})
 
 @rsvps_bp.route('/notifications/<int:notification_id>/read', methods=['PUT'])
 @jwt_required_custom
 def mark_notification_read(notification_id):
-    current_user = get_current_user()
+    current_user = get_current_identity()
     notification = Notification.query.filter_by(id=notification_id, user_id=current_user.id).first_or_404()
     
     notification.read = True
+    record_change('notifications', notification.id, 'update', user_id=current_user.id)
+    bump_users(current_user.id)
     db.session.commit()
     
     return jsonify(notification.to_dict())
+
+@rsvps_bp.route('/notifications/read', methods=['PUT'])
+@jwt_required_custom
+def mark_notifications_read():
+    """
+    Mark notifications as read in one UPDATE: {"ids": [...]} for a list,
+    {"before": cursor} for everything created at or before a page cursor,
+    or an empty body for all of them. Returns how many changed.
+    """
+    current_user = get_current_identity()
+    data = request.get_json(silent=True) or {}
+    
+    query = Notification.query.filter(
+        Notification.user_id == current_user.id,
+        Notification.read == false()
+    )
+    if 'ids' in data:
+        ids = data['ids']
+        # bool is a subclass of int; true must not pass as id 1
+        if not isinstance(ids, list) or not all(type(i) is int for i in ids):
+            return jsonify({'message': 'ids must be a list of integers'}), 400
+        query = query.filter(Notification.id.in_(ids))
+    elif data.get('before'):
+        try:
+            created_at, notification_id = decode_cursor(data['before'])
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+        query = query.filter(or_(
+            Notification.created_at < created_at,
+            and_(Notification.created_at == created_at, Notification.id <= notification_id)
+        ))
+    
+    record_query_changes('notifications', query, 'update')
+    updated = query.update({Notification.read: True}, synchronize_session=False)
+    if updated:
+        bump_users(current_user.id)
+    db.session.commit()
+    
+    return jsonify({'updated': updated})
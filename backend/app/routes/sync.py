@@ -0,0 +1,60 @@
+# backend/app/routes/sync.py
+from datetime import datetime
+from flask import Blueprint, current_app, request, jsonify
+from app.utils import jwt_required_custom, get_current_identity, get_page_limit, encode_cursor, decode_cursor
+from app.services.changes import changes_since, settled_xact_id, caught_up, latest_position, cursor_expired, collapse
+
+sync_bp = Blueprint('sync', __name__)
+
+def _cursor(position, issued_at):
+    """Encode an (xact_id, id) position and when the changes after it began"""
+    xact_id, change_id = position
+    return encode_cursor([xact_id, issued_at.isoformat()], change_id)
+
+def _parse(value):
+    xact_id, issued_at = value
+    return int(xact_id), datetime.fromisoformat(issued_at)
+
+@sync_bp.route('', methods=['GET'])
+@jwt_required_custom
+def sync():
+    """
+    Inserts, updates and deletions the current user can see since ?since=<cursor>.
+    
+    Without ?since the response only carries a cursor for now: take it
+    first, then load the lists and sync from it. Keep requesting while
+    has_more is true. A cursor older than CHANGE_LOG_TTL_DAYS gets 410:
+    the changes after it may be pruned, so reload and start over.
+    """
+    current_user = get_current_identity()
+    try:
+        limit = get_page_limit()
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    now = datetime.utcnow()
+    settled = settled_xact_id()
+    if not request.args.get('since'):
+        return jsonify({'cursor': _cursor(latest_position(settled), now), 'changes': {}, 'has_more': False})
+    try:
+        (xact_id, issued_at), change_id = decode_cursor(request.args['since'], parse=_parse)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    if cursor_expired(issued_at, current_app.config['CHANGE_LOG_TTL_DAYS']):
+        return jsonify({'message': 'Cursor too old, reload and sync from a new cursor'}), 410
+    
+    position = (xact_id, change_id)
+    changes = changes_since(current_user.id, position, settled, limit + 1)
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    
+    if changes:
+        position = (changes[-1].xact_id, changes[-1].id)
+    if not has_more:
+        # Caught up: changes after this cursor begin from now
+        position, issued_at = caught_up(position, settled), now
+    return jsonify({
+        'cursor': _cursor(position, issued_at),
+        'changes': collapse(changes),
+        'has_more': has_more
+    })
@@ -2,17 +2,24 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
 from app import db
-from app.models import Task, Event, Invite
-from app.utils import jwt_required_custom, get_current_user
+from app.models import Task, Event, Invite, serialization_options
+from app.utils import jwt_required_custom, get_current_identity, parse_fieldset
+from app.versioning import bump_event, make_etag, not_modified, with_etag
+from app.services.changes import record_change
 
 tasks_bp = Blueprint('tasks', __name__)
 
 @tasks_bp.route('/event/<int:event_id>', methods=['GET'])
 @jwt_required_custom
 def get_event_tasks(event_id):
-    current_user = get_current_user()
+    current_user = get_current_identity()
     event = Event.query.get_or_404(event_id)
     
+    try:
+        fields, include = parse_fieldset(Task)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
     # Check if user is the creator OR has been invited to this event
     if event.user_id != current_user.id:
         invite = Invite.query.filter_by(
@@ -22,14 +29,20 @@ def get_event_tasks(event_id):
         if not invite:
             return jsonify({'message': 'Unauthorized - you are not invited to this event'}), 403
     
-    return jsonify([task.to_dict() for task in event.tasks])
+    etag = make_etag(event.id, event.version)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    tasks = Task.query.options(*serialization_options(Task, fields, include)).filter_by(event_id=event.id).all()
+    return with_etag(jsonify([task.to_dict(fields, include) for task in tasks]), etag)
 
 @tasks_bp.route('/event/<int:event_id>', methods=['POST'])
 @jwt_required_custom
 def create_task(event_id):
     try:
         event = Event.query.get_or_404(event_id)
-        current_user = get_current_user()
+        current_user = get_current_identity()
         
         if not current_user:
             return jsonify({'message': 'User not found'}), 404
@@ -58,6 +71,10 @@ def create_task(event_id):
         )
         
         db.session.add(task)
+        db.session.flush()
+        record_change('tasks', task.id, 'insert', event_id=event_id)
+        Event.adjust_count(event_id, Event.tasks_count, 1)
+        bump_event(event_id)
         db.session.commit()
         
         return jsonify(task.to_dict()), 201
@@ -69,7 +86,7 @@ def create_task(event_id):
 @jwt_required_custom
 def update_task(task_id):
     task = Task.query.get_or_404(task_id)
-    current_user = get_current_user()
+    current_user = get_current_identity()
     
     if task.event.user_id != current_user.id:
         return jsonify({'message': 'Unauthorized'}), 403
@@ -82,6 +99,8 @@ def update_task(task_id):
     if 'due_date' in data:
         task.due_date = datetime.fromisoformat(data['due_date']) if data['due_date'] else None
     
+    record_change('tasks', task.id, 'update', event_id=task.event_id)
+    bump_event(task.event_id)
     db.session.commit()
     return jsonify(task.to_dict())
 
@@ -89,12 +108,15 @@ def update_task(task_id):
 @jwt_required_custom
 def delete_task(task_id):
     task = Task.query.get_or_404(task_id)
-    current_user = get_current_user()
+    current_user = get_current_identity()
     
     if task.event.user_id != current_user.id:
         return jsonify({'message': 'Unauthorized'}), 403
     
     db.session.delete(task)
+    record_change('tasks', task.id, 'delete', event_id=task.event_id)
+    Event.adjust_count(task.event_id, Event.tasks_count, -1)
+    bump_event(task.event_id)
     db.session.commit()
     
     return jsonify({'message': 'Task deleted'}), 200
@@ -0,0 +1,165 @@
+# backend/app/services/changes.py
+from datetime import datetime, timedelta
+from sqlalchemy import BigInteger, Text, cast, func, insert, literal, or_, select, tuple_, union
+from app import db
+from app.models import ChangeLog, Event, Invite, Task, RSVP, Notification, User, serialization_options
+from app.versioning import event_audience
+
+# Sync key -> model whose current rows are sent for inserts and updates
+ENTITIES = {
+    'events': Event,
+    'tasks': Task,
+    'rsvps': RSVP,
+    'invites': Invite,
+    'notifications': Notification,
+    'users': User,
+}
+
+# Pruning keeps change_log rows this much longer than CHANGE_LOG_TTL_DAYS,
+# which is how long a sync cursor stays valid; a change can be logged by a
+# transaction that began a while before the cursor past it was issued
+PRUNE_SLACK = timedelta(days=1)
+
+def current_xact_id():
+    """
+    SQL for the id of the transaction logging a change: its xid on PostgreSQL,
+    0 on SQLite, whose single writer commits changes in id order anyway
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return cast(cast(func.pg_current_xact_id(), Text), BigInteger)
+    return literal(0)
+
+def settled_xact_id():
+    """
+    On PostgreSQL, the oldest transaction still running: every change logged
+    with a lower xact_id has committed or rolled back, whatever its id. None
+    on SQLite, where every committed change is settled.
+    """
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return None
+    return db.session.scalar(select(cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)))
+
+def record_change(entity, entity_id, op, event_id=None, user_id=None):
+    """Log a change in the current transaction, visible through event_id or to user_id"""
+    record_changes([{'entity': entity, 'entity_id': entity_id, 'op': op, 'event_id': event_id, 'user_id': user_id}])
+
+def record_changes(changes):
+    """Log several changes, given as dicts of ChangeLog fields, in one INSERT"""
+    if changes:
+        now = datetime.utcnow()
+        db.session.execute(insert(ChangeLog).values(xact_id=current_xact_id()), [{'event_id': None, 'user_id': None, 'created_at': now, **change} for change in changes])
+
+def invite_changes(invite_id, event_id, invitee_id, inviter_id, op):
+    """
+    Changes for an invite, logged for its two users only since other guests
+    do not see it. Its invitee gains or loses the event along with it.
+    """
+    changes = [
+        {'entity': 'invites', 'entity_id': invite_id, 'op': op, 'user_id': user_id}
+        for user_id in {invitee_id, inviter_id} if user_id is not None
+    ]
+    if op != 'update' and invitee_id is not None:
+        changes.append({'entity': 'events', 'entity_id': event_id, 'op': op, 'user_id': invitee_id})
+    return changes
+
+def record_event_shared(event_id, user_ids):
+    """
+    Log an event's current tasks and RSVPs for users who were just invited to
+    it. Their earlier changes went to the event's audience at the time, behind
+    the new guests' cursors, so without these they would never sync.
+    """
+    rows = [('tasks', task_id) for task_id in db.session.scalars(select(Task.id).where(Task.event_id == event_id))]
+    rows.extend(('rsvps', rsvp_id) for rsvp_id in db.session.scalars(select(RSVP.id).where(RSVP.event_id == event_id)))
+    record_changes([
+        {'entity': entity, 'entity_id': entity_id, 'op': 'insert', 'user_id': user_id}
+        for user_id in user_ids for entity, entity_id in rows
+    ])
+
+def record_event_deleted(event_id):
+    """
+    Log an event's tombstone for each user who can see it. Call before the
+    delete; once the event and its invites are gone nobody could see an
+    event-wide change. Clients drop the event's tasks and RSVPs with it.
+    """
+    audience = event_audience(event_id).subquery()
+    db.session.execute(insert(ChangeLog).from_select(
+        ['entity', 'entity_id', 'op', 'user_id', 'xact_id', 'created_at'],
+        select(literal('events'), literal(event_id), literal('delete'), audience.c.user_id, current_xact_id(), literal(datetime.utcnow()))
+    ))
+
+def record_query_changes(entity, query, op):
+    """Log a change to every row of a user-owned ORM query (e.g. one about to be bulk updated)"""
+    model = ENTITIES[entity]
+    db.session.execute(insert(ChangeLog).from_select(
+        ['entity', 'entity_id', 'op', 'user_id', 'xact_id', 'created_at'],
+        query.with_entities(literal(entity), model.id, literal(op), model.user_id, current_xact_id(), literal(datetime.utcnow()))
+    ))
+
+def visible_changes(user_id):
+    """Condition matching the change log rows user_id may see"""
+    visible_events = union(
+        select(Event.id).where(Event.user_id == user_id),
+        select(Invite.event_id).where(Invite.invitee_id == user_id),
+    )
+    return or_(ChangeLog.user_id == user_id, ChangeLog.event_id.in_(visible_events))
+
+def changes_since(user_id, position, settled, limit):
+    """
+    The user's changes after position, an (xact_id, id) pair, oldest first.
+    
+    Ids are handed out at insert but become visible at commit, so a slower
+    transaction can commit a lower id after a client synced past it. Only
+    changes from transactions below settled (see settled_xact_id) are read,
+    in (xact_id, id) order; those can no longer be joined by anything that
+    would sort before them.
+    """
+    xact_id, change_id = position
+    query = ChangeLog.query.filter(
+        tuple_(ChangeLog.xact_id, ChangeLog.id) > tuple_(xact_id, change_id),
+        visible_changes(user_id)
+    )
+    if settled is not None:
+        query = query.filter(ChangeLog.xact_id < settled)
+    return query.order_by(ChangeLog.xact_id, ChangeLog.id).limit(limit).all()
+
+def caught_up(position, settled):
+    """
+    Where a client continues once it has read every settled change after
+    position: past all settled transactions on PostgreSQL, so the next sync
+    skips them, or where it is on SQLite
+    """
+    return max(position, (settled, 0)) if settled is not None else position
+
+def latest_position(settled):
+    """The position of the newest settled change; a client takes it before loading the lists and syncs from there"""
+    if settled is not None:
+        return (settled, 0)
+    return (0, db.session.scalar(select(func.max(ChangeLog.id))) or 0)
+
+def cursor_expired(issued_at, ttl_days):
+    """Whether changes a cursor issued at issued_at still needs may have been pruned"""
+    return bool(ttl_days) and issued_at < datetime.utcnow() - timedelta(days=ttl_days)
+
+def collapse(changes):
+    """
+    Turn a run of changes into {entity: {'upserts': [rows], 'deletes': [ids]}}
+    holding the current version of each changed row. Only the last change
+    to a row counts, and rows gone since are reported as deleted.
+    """
+    last = {}
+    for change in changes:
+        last[(change.entity, change.entity_id)] = change.op
+    
+    result = {}
+    for entity, model in ENTITIES.items():
+        ids = [entity_id for (name, entity_id), op in last.items() if name == entity and op != 'delete']
+        deletes = [entity_id for (name, entity_id), op in last.items() if name == entity and op == 'delete']
+        query = model.query.filter(model.id.in_(ids))
+        if hasattr(model, 'field_sources'):
+            query = query.options(*serialization_options(model))
+        rows = query.all() if ids else []
+        found = {row.id for row in rows}
+        deletes.extend(entity_id for entity_id in ids if entity_id not in found)
+        if rows or deletes:
+            result[entity] = {'upserts': [row.to_dict() for row in rows], 'deletes': deletes}
+    return result
@@ -0,0 +1,117 @@
+# backend/app/services/event_import.py
+import csv
+import io
+import json
+from sqlalchemy import insert
+from app import db
+from app.models import Event
+from app.utils import parse_event_date
+from app.services.search import index_events
+from app.services.changes import record_changes
+
+# Rows sent to the database per INSERT
+BATCH_SIZE = 1000
+# Per-row errors listed in the response; the rest are only counted
+MAX_REPORTED_ERRORS = 500
+
+class ImportFormatError(ValueError):
+    """The upload is not CSV or JSON lines, or cannot be parsed as its format"""
+
+def detect_format(filename, content_type):
+    """Return 'csv' or 'jsonl' from an upload's filename or content type"""
+    filename = (filename or '').lower()
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if filename.endswith('.csv') or content_type in ('text/csv', 'application/csv'):
+        return 'csv'
+    if filename.endswith(('.jsonl', '.ndjson')) or content_type in (
+        'application/jsonl', 'application/x-ndjson', 'application/x-jsonlines'
+    ):
+        return 'jsonl'
+    raise ImportFormatError('Upload must be CSV (text/csv) or JSON lines (application/x-ndjson)')
+
+def read_rows(stream, fmt):
+    """
+    Yield (line number, row dict or error message) from a binary stream
+    without reading it all into memory. Raises ImportFormatError on CSV the
+    reader cannot split into rows (e.g. NUL bytes or an oversized field).
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        try:
+            for row in reader:
+                yield reader.line_num, row
+        except csv.Error as e:
+            raise ImportFormatError(f'Malformed CSV at row {reader.reader.line_num}: {e}')
+        return
+    
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, f'Invalid JSON: {e}'
+            continue
+        yield line_number, row if isinstance(row, dict) else 'Each line must be a JSON object'
+
+def validate_row(row, user_id):
+    """Turn an uploaded row into Event column values, applying the create_event rules"""
+    title = str(row.get('title') or '').strip()
+    if not title:
+        raise ValueError('Title is required')
+    if len(title) > Event.title.type.length:
+        raise ValueError(f'Title is longer than {Event.title.type.length} characters')
+    if not row.get('date'):
+        raise ValueError('Date is required')
+    try:
+        date = parse_event_date(row['date'])
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'Invalid date format: {str(e)}')
+    location = str(row['location']) if row.get('location') else None
+    if location and len(location) > Event.location.type.length:
+        raise ValueError(f'Location is longer than {Event.location.type.length} characters')
+    return {
+        'title': title,
+        'description': str(row['description']) if row.get('description') else None,
+        'date': date,
+        'location': location,
+        'user_id': user_id
+    }
+
+def import_events(rows, user_id):
+    """
+    Insert valid rows in batches inside the caller's transaction.
+    
+    Returns (imported count, failed count, reported errors). The caller
+    commits or rolls back.
+    """
+    imported = 0
+    failed = 0
+    errors = []
+    batch = []
+    
+    def flush():
+        # Executemany with RETURNING; one round trip per batch on both backends
+        ids = db.session.execute(insert(Event).returning(Event.id), batch).scalars().all()
+        index_events(ids)
+        record_changes([{'entity': 'events', 'entity_id': event_id, 'op': 'insert', 'event_id': event_id} for event_id in ids])
+        batch.clear()
+        return len(ids)
+    
+    for line_number, row in rows:
+        try:
+            if isinstance(row, str):
+                raise ValueError(row)
+            batch.append(validate_row(row, user_id))
+        except ValueError as e:
+            failed += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({'row': line_number, 'message': str(e)})
+            continue
+        if len(batch) >= BATCH_SIZE:
+            imported += flush()
+    
+    if batch:
+        imported += flush()
+    return imported, failed, errors
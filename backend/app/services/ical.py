@@ -0,0 +1,141 @@
+# backend/app/services/ical.py
+import hashlib
+import re
+from flask import current_app
+from itsdangerous import URLSafeSerializer, BadSignature
+
+# Events have no end time, so feeds give every VEVENT this length
+DEFAULT_DURATION = 'PT1H'
+
+def _serializer():
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt='ics-feed')
+
+def _password_fingerprint(user):
+    return hashlib.sha256(user.password_hash.encode()).hexdigest()[:16]
+
+def make_feed_token(user):
+    """
+    Signed token that identifies the user in calendar subscription URLs.
+    It stays valid until user.feed_token_version is bumped (on password
+    change), not whenever the stored password hash is rewritten.
+    """
+    return _serializer().dumps({'uid': user.id, 'v': user.feed_token_version})
+
+def read_feed_token(token):
+    """Return (user id, token claims) from a feed token, or None if it is invalid"""
+    try:
+        data = _serializer().loads(token)
+        return int(data['uid']), data
+    except (BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+def feed_token_matches(user, claims):
+    if user is None:
+        return False
+    if 'v' in claims:
+        return claims['v'] == user.feed_token_version
+    # Tokens issued before feed_token_version carry a password fingerprint
+    # and last until the password hash changes
+    return claims.get('pw') == _password_fingerprint(user)
+
+def escape_text(value):
+    """Escape a TEXT value (RFC 5545 section 3.3.11)"""
+    return (value or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n')
+
+def fold(line):
+    """Fold a content line into 75-octet chunks (RFC 5545 section 3.1)"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    chunks = []
+    while encoded:
+        limit = 75 if not chunks else 74
+        cut = min(limit, len(encoded))
+        # Never split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        chunks.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    return '\r\n '.join(chunks) + '\r\n'
+
+def format_datetime(value, utc=False):
+    return value.strftime('%Y%m%dT%H%M%S') + ('Z' if utc else '')
+
+def utc_rule(rule):
+    """
+    An RRULE with its UNTIL marked as UTC; stored rules leave it unmarked like
+    event dates, but RFC 5545 requires UTC there once DTSTART is in UTC
+    """
+    return re.sub(r'(UNTIL=\d{8}T\d{6})(?!Z)', r'\1Z', rule)
+
+def vevent(event_id, title, description, date, location, created_at, invite_status=None, recurrence_rule=None,
+           exdates=(), recurrence_id=None):
+    """
+    Content lines of one VEVENT; event dates are stored as naive UTC.
+    
+    ``exdates`` are cancelled occurrences of a recurring event, and
+    ``recurrence_id`` makes this VEVENT the edited copy of one occurrence.
+    """
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:event-{event_id}@event-planner',
+        f'DTSTAMP:{format_datetime(created_at or date, utc=True)}',
+    ]
+    if recurrence_id:
+        lines.append(f'RECURRENCE-ID:{format_datetime(recurrence_id, utc=True)}')
+    lines.extend([
+        f'DTSTART:{format_datetime(date, utc=True)}',
+        f'DURATION:{DEFAULT_DURATION}',
+        f'SUMMARY:{escape_text(title)}',
+    ])
+    if description:
+        lines.append(f'DESCRIPTION:{escape_text(description)}')
+    if location:
+        lines.append(f'LOCATION:{escape_text(location)}')
+    if invite_status:
+        lines.append(f'STATUS:{"CONFIRMED" if invite_status == "accepted" else "TENTATIVE"}')
+    if recurrence_rule:
+        lines.append(f'RRULE:{utc_rule(recurrence_rule)}')
+        lines.extend(f'EXDATE:{format_datetime(exdate, utc=True)}' for exdate in exdates)
+    lines.append('END:VEVENT')
+    return ''.join(fold(line) for line in lines)
+
+def series_vevents(row, overrides):
+    """
+    VEVENTs for one event row: the event itself with its cancelled
+    occurrences excluded, then one VEVENT per edited occurrence
+    """
+    event_id, title, description, date, location, created_at, invite_status, recurrence_rule = row
+    cancelled = [override.original_date for override in overrides if override.cancelled]
+    parts = [vevent(*row, exdates=cancelled)]
+    for override in overrides:
+        if override.cancelled:
+            continue
+        parts.append(vevent(
+            event_id,
+            override.title if override.title is not None else title,
+            override.description if override.description is not None else description,
+            override.date or override.original_date,
+            override.location if override.location is not None else location,
+            created_at,
+            invite_status,
+            recurrence_id=override.original_date
+        ))
+    return ''.join(parts)
+
+def calendar(rows, name, overrides=None):
+    """
+    Generate the feed one event at a time from an iterable of event rows;
+    ``overrides`` maps recurring event ids to their EventOccurrence rows
+    """
+    overrides = overrides or {}
+    yield ''.join(fold(line) for line in [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Event Planner//Events Feed//EN',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{escape_text(name)}',
+    ])
+    for row in rows:
+        yield series_vevents(row, overrides.get(row[0], ()))
+    yield fold('END:VCALENDAR')
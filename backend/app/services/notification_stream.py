@@ -0,0 +1,176 @@
+# backend/app/services/notification_stream.py
+import json
+import logging
+import queue
+import threading
+import time
+from flask import current_app
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+from sqlalchemy import event as sa_event, func
+from sqlalchemy.orm import Session
+from app import db
+from app.models import Notification
+
+logger = logging.getLogger(__name__)
+
+# Notifications fetched per poll of the table
+TAIL_BATCH_SIZE = 500
+# Undelivered notifications a slow client may have queued before it is cut off
+SUBSCRIBER_QUEUE_SIZE = 100
+
+class TooManyStreams(Exception):
+    """This process already serves NOTIFICATION_STREAMS_PER_PROCESS streams"""
+
+class NotificationBroker:
+    """
+    In-process pub/sub for new notifications.
+    
+    Every web process tails the notification table by id and publishes each
+    new row to the streams of its user in this process. The table is the
+    shared log, so notifications written by any worker (or any process
+    draining the outbox) reach every subscriber without an external broker.
+    Commits in this process wake the tailer at once; otherwise it polls.
+    
+    Ids are handed out at insert but become visible at commit, so a lower id
+    can appear after a higher one. The tailer therefore rescans every id above
+    ``floor``, publishing only rows it has not published yet, and moves
+    ``floor`` up only past ids it first saw NOTIFICATION_STREAM_LOOKBACK_SECONDS
+    ago. Everything at or below ``floor`` has been published, which makes it
+    the resume point sent as the SSE event id.
+    """
+    
+    def __init__(self):
+        self.subscribers = {}
+        self.streams = 0
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.floor = None
+        # Published ids above floor -> monotonic time they were first seen
+        self.recent = {}
+    
+    def subscribe(self, app, user_id):
+        """
+        Register a stream for user_id and return the queue it reads from.
+        Raises TooManyStreams when this process is at its limit: each stream
+        holds a request thread for as long as it stays open.
+        """
+        stream = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self.lock:
+            if self.streams >= app.config['NOTIFICATION_STREAMS_PER_PROCESS']:
+                raise TooManyStreams()
+            self.streams += 1
+            self.subscribers.setdefault(user_id, set()).add(stream)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.tail, args=(app,), name='notification-tail', daemon=True)
+                self.thread.start()
+        self.wakeup.set()
+        return stream
+    
+    def unsubscribe(self, user_id, stream):
+        with self.lock:
+            self.streams -= 1
+            streams = self.subscribers.get(user_id, set())
+            streams.discard(stream)
+            if not streams:
+                self.subscribers.pop(user_id, None)
+    
+    def publish(self, user_id, cursor, data):
+        with self.lock:
+            streams = list(self.subscribers.get(user_id, ()))
+        for stream in streams:
+            try:
+                stream.put_nowait((cursor, data))
+            except queue.Full:
+                # The client is not keeping up: drop its backlog and end the stream;
+                # it reconnects and replays from its Last-Event-ID
+                with stream.mutex:
+                    stream.queue.clear()
+                stream.put_nowait(None)
+    
+    def tail(self, app):
+        while True:
+            self.wakeup.wait(app.config['NOTIFICATION_POLL_INTERVAL'])
+            self.wakeup.clear()
+            with self.lock:
+                if not self.subscribers:
+                    continue
+            with app.app_context():
+                try:
+                    self.poll(app.config['NOTIFICATION_STREAM_LOOKBACK_SECONDS'])
+                except Exception:
+                    logger.exception('Notification stream poll failed')
+                finally:
+                    db.session.remove()
+    
+    def poll(self, lookback):
+        """Publish notifications that became visible since the last poll"""
+        if self.floor is None:
+            self.floor = db.session.query(func.max(Notification.id)).scalar() or 0
+            return
+        now = time.monotonic()
+        after = self.floor
+        while True:
+            rows = Notification.query.filter(Notification.id > after).order_by(Notification.id).limit(TAIL_BATCH_SIZE).all()
+            for notification in rows:
+                after = notification.id
+                if notification.id not in self.recent:
+                    self.recent[notification.id] = now
+                    self.publish(notification.user_id, self.floor, notification.to_dict())
+            if len(rows) < TAIL_BATCH_SIZE:
+                break
+        # A transaction still open after the lookback is assumed gone, so its
+        # ids are no longer waited for
+        settled = [notification_id for notification_id, seen in self.recent.items() if now - seen >= lookback]
+        if settled:
+            self.floor = max(settled)
+            self.recent = {notification_id: seen for notification_id, seen in self.recent.items() if notification_id > self.floor}
+
+broker = NotificationBroker()
+
+def replay(user_id, last_event_id, limit=TAIL_BATCH_SIZE):
+    """
+    (cursor, notification) pairs for the user's notifications after the
+    resume cursor last_event_id, oldest first. A row's cursor is its own id
+    only once the tailer has settled past it; newer rows carry the tailer's
+    floor, so resuming from them replays anything that commits late.
+    """
+    floor = broker.floor if broker.floor is not None else last_event_id
+    return [
+        (min(notification.id, max(floor, last_event_id)), notification.to_dict())
+        for notification in Notification.query.filter(
+            Notification.user_id == user_id,
+            Notification.id > last_event_id
+        ).order_by(Notification.id).limit(limit)
+    ]
+
+def _token_serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='notification-stream')
+
+def make_stream_token(user_id):
+    """Short-lived token for opening a notification stream, since EventSource cannot send headers"""
+    return _token_serializer().dumps({'uid': user_id})
+
+def read_stream_token(token):
+    """The user id a stream token was issued to, or None if it is invalid or expired"""
+    try:
+        data = _token_serializer().loads(token, max_age=current_app.config['NOTIFICATION_STREAM_TOKEN_SECONDS'])
+        return int(data['uid'])
+    except (BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+def format_event(cursor, data):
+    """
+    One SSE message carrying a notification. Its id is the resume cursor,
+    not the notification's id; clients tell repeats apart by data.id.
+    """
+    return f'id: {cursor}\nevent: notification\ndata: {json.dumps(data)}\n\n'
+
+@sa_event.listens_for(Session, 'after_commit')
+def _wake_tail(session):
+    if session.info.pop('notifications_written', False):
+        broker.wakeup.set()
+
+@sa_event.listens_for(Session, 'after_rollback')
+def _forget_written(session):
+    session.info.pop('notifications_written', None)
@@ -0,0 +1,116 @@
+# backend/app/services/notifications.py
+from collections import Counter
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, false, func, select
+from app import db
+from app.models import Notification
+from app.versioning import bump_users
+from app.services.changes import record_change, record_changes
+from app.services.outbox import enqueue, handler
+
+# Lines listed in a digest before the rest are summed up
+DIGEST_LINES = 10
+
+def notify(user_id, type, title, message='', related_id=None, merged_title=None):
+    """
+    Queue a notification for user_id, written once the current transaction
+    commits. merged_title, with {count} filled in, replaces title and message
+    once repeats from other sources are folded into the row.
+    """
+    notification = {'user_id': user_id, 'type': type, 'title': title, 'message': message, 'related_id': related_id}
+    if merged_title:
+        notification['merged_title'] = merged_title
+    notify_many([notification])
+
+def notify_many(notifications):
+    """Queue several notifications given as dicts of Notification fields (plus optional merged_title)"""
+    enqueue('notification', notifications)
+
+def _take_unread(user_id, *conditions):
+    """Delete the user's unread notifications matching conditions, returning their (title, count)"""
+    taken = db.session.execute(
+        delete(Notification).where(Notification.user_id == user_id, Notification.read == false(), *conditions)
+        .returning(Notification.id, Notification.title, Notification.count)
+    ).all()
+    record_changes([{'entity': 'notifications', 'entity_id': row.id, 'op': 'delete', 'user_id': user_id} for row in taken])
+    return [(row.title, row.count) for row in taken]
+
+def _written(notification):
+    record_change('notifications', notification.id, 'insert', user_id=notification.user_id)
+    bump_users(notification.user_id)
+    # Wakes the SSE tailer in this process once the batch commits
+    db.session.info['notifications_written'] = True
+
+@handler('notification')
+def create_notification(payload):
+    payload = dict(payload)
+    merged_title = payload.pop('merged_title', None)
+    notification = Notification(**payload)
+    db.session.add(notification)
+    window = current_app.config['NOTIFICATION_COALESCE_MINUTES']
+    if window and payload.get('related_id') is not None:
+        # Fold recent unread repeats into the new row. Replacing them rather
+        # than updating one gives the row a new id, so SSE streams and
+        # Last-Event-ID replays, which follow ids, deliver it again. It is
+        # inserted first so SQLite cannot hand it a deleted row's id
+        db.session.flush()
+        notification.count = 1 + sum(count for _, count in _take_unread(
+            payload['user_id'],
+            Notification.id != notification.id,
+            Notification.type == payload['type'],
+            Notification.related_id == payload['related_id'],
+            Notification.created_at >= datetime.utcnow() - timedelta(minutes=window)
+        ))
+        if notification.count > 1 and merged_title:
+            # The text is only the latest repeat's, not what the count adds up
+            notification.title = merged_title.replace('{count}', str(notification.count))
+            notification.message = ''
+    db.session.flush()
+    _written(notification)
+
+def digest_notifications(types, min_count):
+    """
+    Replace the unread notifications of the given types of every user with
+    at least min_count of them by a single digest. Commits per user and
+    returns the number of digests written.
+    """
+    unread = (Notification.read == false(), Notification.type.in_(types))
+    user_ids = db.session.scalars(
+        select(Notification.user_id).where(*unread)
+        .group_by(Notification.user_id)
+        .having(func.sum(Notification.count) >= min_count)
+    ).all()
+    
+    written = 0
+    for user_id in user_ids:
+        # Inserted before the rows it replaces so it gets a newer id
+        digest = Notification(user_id=user_id, type='digest', title='', message='')
+        db.session.add(digest)
+        db.session.flush()
+        
+        titles = Counter()
+        for title, count in _take_unread(
+            user_id,
+            Notification.id != digest.id,
+            Notification.type.in_(types)
+        ):
+            titles[title] += count
+        if not titles:
+            # Read since the user ids were collected
+            db.session.rollback()
+            continue
+        
+        lines = [
+            f'{title} (+{count - 1} more)' if count > 1 else title
+            for title, count in titles.most_common(DIGEST_LINES)
+        ]
+        if len(titles) > DIGEST_LINES:
+            lines.append(f'...and {sum(count for _, count in titles.most_common()[DIGEST_LINES:])} more')
+        digest.count = sum(titles.values())
+        digest.title = f'{digest.count} updates while you were away'
+        digest.message = '\n'.join(lines)
+        _written(digest)
+        db.session.commit()
+        written += 1
+    return written
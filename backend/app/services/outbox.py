@@ -0,0 +1,132 @@
+# backend/app/services/outbox.py
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import event as sa_event, insert, select, update
+from sqlalchemy.orm import Session
+from app import db
+from app.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+# topic -> handler(payload), registered with @handler
+HANDLERS = {}
+# Failed messages are retried with exponential backoff, then left in the table for inspection
+MAX_ATTEMPTS = 5
+# How long a worker owns a claimed batch before another worker may take it over
+LEASE = timedelta(minutes=1)
+
+# Set after a commit that enqueued messages, so idle workers in this process drain at once
+_wakeup = threading.Event()
+
+def handler(topic):
+    """Register the function that carries out messages of ``topic``"""
+    def register(fn):
+        HANDLERS[topic] = fn
+        return fn
+    return register
+
+def enqueue(topic, payloads):
+    """
+    Record side effects in the current transaction. They are carried out by
+    an outbox worker once it commits, and are discarded if it rolls back.
+    """
+    if not payloads:
+        return
+    now = datetime.utcnow()
+    db.session.execute(insert(OutboxMessage), [
+        {'topic': topic, 'payload': payload, 'attempts': 0, 'available_at': now, 'created_at': now}
+        for payload in payloads
+    ])
+    db.session.info['outbox_pending'] = True
+
+@sa_event.listens_for(Session, 'after_commit')
+def _wake_workers(session):
+    if session.info.pop('outbox_pending', False):
+        _wakeup.set()
+
+@sa_event.listens_for(Session, 'after_rollback')
+def _forget_pending(session):
+    session.info.pop('outbox_pending', None)
+
+def drain(batch_size):
+    """
+    Claim up to batch_size due messages and run their handlers, returning how
+    many were claimed. Claiming is a single UPDATE, so concurrent workers in
+    any process never run the same message twice while its lease holds.
+    """
+    now = datetime.utcnow()
+    token = uuid.uuid4().hex
+    due = select(OutboxMessage.id).where(
+        OutboxMessage.available_at <= now,
+        OutboxMessage.attempts < MAX_ATTEMPTS
+    ).order_by(OutboxMessage.id).limit(batch_size)
+    claimed = db.session.execute(
+        update(OutboxMessage).where(
+            OutboxMessage.id.in_(due),
+            OutboxMessage.available_at <= now
+        ).values(claim_token=token, available_at=now + LEASE),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+    db.session.commit()
+    if not claimed:
+        return 0
+    
+    for message in OutboxMessage.query.filter_by(claim_token=token).order_by(OutboxMessage.id):
+        try:
+            # A savepoint per message, so one failure does not undo the batch
+            with db.session.begin_nested():
+                HANDLERS[message.topic](message.payload)
+            db.session.delete(message)
+        except Exception as e:
+            message.attempts += 1
+            message.last_error = f'{type(e).__name__}: {e}'
+            logger.warning('Outbox message failed', extra={'topic': message.topic, 'attempts': message.attempts, 'error': message.last_error})
+            message.available_at = datetime.utcnow() + timedelta(seconds=2 ** message.attempts)
+            message.claim_token = None
+    db.session.commit()
+    return claimed
+
+def drain_all(batch_size):
+    """Drain until no due messages are left, returning how many were claimed"""
+    total = 0
+    while True:
+        claimed = drain(batch_size)
+        total += claimed
+        if claimed < batch_size:
+            return total
+
+class WorkerPool:
+    """Daemon threads that drain the outbox in the background of a web process"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.size = app.config['OUTBOX_WORKERS']
+        self.batch_size = app.config['OUTBOX_BATCH_SIZE']
+        self.poll_interval = app.config['OUTBOX_POLL_INTERVAL']
+        self.threads = []
+        self.lock = threading.Lock()
+    
+    def start(self):
+        """Start the threads once; later calls do nothing"""
+        with self.lock:
+            if self.threads:
+                return
+            for number in range(self.size):
+                thread = threading.Thread(target=self.run, name=f'outbox-worker-{number}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+    
+    def run(self):
+        while True:
+            with self.app.app_context():
+                try:
+                    claimed = drain(self.batch_size)
+                except Exception:
+                    db.session.rollback()
+                    logger.exception('Outbox worker failed')
+                    claimed = 0
+            if claimed < self.batch_size:
+                _wakeup.wait(self.poll_interval)
+                _wakeup.clear()
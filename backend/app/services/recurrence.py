@@ -0,0 +1,268 @@
+# backend/app/services/recurrence.py
+import calendar
+from collections import namedtuple
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
+from app.models import Event, EventOccurrence
+from app.utils import encode_cursor
+
+# Supported subset of RFC 5545 RRULE: FREQ, INTERVAL, COUNT, UNTIL and, for
+# weekly rules, BYDAY (without ordinals)
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+MAX_COUNT = 1000
+# Upper bound on occurrences produced for one series in one expansion
+MAX_EXPANSION = 2000
+
+def parse_rule(rule):
+    """Parse and validate an RRULE string, raising ValueError with a user-facing message"""
+    parts = {}
+    for part in rule.upper().removeprefix('RRULE:').split(';'):
+        if not part:
+            continue
+        name, sep, value = part.partition('=')
+        if not sep or not value:
+            raise ValueError(f'Invalid recurrence rule part: {part}')
+        parts[name] = value
+    
+    unknown = set(parts) - {'FREQ', 'INTERVAL', 'COUNT', 'UNTIL', 'BYDAY'}
+    if unknown:
+        raise ValueError(f'Unsupported recurrence rule parts: {", ".join(sorted(unknown))}')
+    if parts.get('FREQ') not in FREQUENCIES:
+        raise ValueError(f'FREQ must be one of {", ".join(FREQUENCIES)}')
+    if 'COUNT' in parts and 'UNTIL' in parts:
+        raise ValueError('COUNT and UNTIL cannot both be set')
+    
+    parsed = {'freq': parts['FREQ'], 'interval': 1, 'count': None, 'until': None, 'byday': None}
+    try:
+        parsed['interval'] = int(parts.get('INTERVAL', 1))
+        if 'COUNT' in parts:
+            parsed['count'] = int(parts['COUNT'])
+    except ValueError:
+        raise ValueError('INTERVAL and COUNT must be integers')
+    if parsed['interval'] < 1:
+        raise ValueError('INTERVAL must be positive')
+    if parsed['count'] is not None and not 1 <= parsed['count'] <= MAX_COUNT:
+        raise ValueError(f'COUNT must be between 1 and {MAX_COUNT}')
+    
+    if 'UNTIL' in parts:
+        value = parts['UNTIL'].rstrip('Z')
+        try:
+            parsed['until'] = datetime.strptime(value, '%Y%m%dT%H%M%S') if 'T' in value else \
+                datetime.strptime(value, '%Y%m%d').replace(hour=23, minute=59, second=59)
+        except ValueError:
+            raise ValueError('UNTIL must look like 20301231 or 20301231T235959')
+    
+    if 'BYDAY' in parts:
+        if parsed['freq'] != 'WEEKLY':
+            raise ValueError('BYDAY is only supported with FREQ=WEEKLY')
+        days = parts['BYDAY'].split(',')
+        if not days or any(day not in WEEKDAYS for day in days):
+            raise ValueError(f'BYDAY must be a list of {",".join(WEEKDAYS)}')
+        parsed['byday'] = sorted(WEEKDAYS.index(day) for day in set(days))
+    return parsed
+
+def format_rule(rule):
+    """Canonical RRULE string for a parsed rule; UNTIL is naive UTC like event dates"""
+    parts = [f'FREQ={rule["freq"]}']
+    if rule['interval'] != 1:
+        parts.append(f'INTERVAL={rule["interval"]}')
+    if rule['count'] is not None:
+        parts.append(f'COUNT={rule["count"]}')
+    if rule['until'] is not None:
+        parts.append(f'UNTIL={rule["until"].strftime("%Y%m%dT%H%M%S")}')
+    if rule['byday']:
+        parts.append(f'BYDAY={",".join(WEEKDAYS[day] for day in rule["byday"])}')
+    return ';'.join(parts)
+
+def _add_months(value, months):
+    """value shifted by whole months, or None when that month lacks the day (RFC 5545 skips it)"""
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    if value.day > calendar.monthrange(year, month)[1]:
+        return None
+    return value.replace(year=year, month=month)
+
+def _period_occurrences(start, rule, period):
+    """Occurrences in the ``period``-th interval after start, in order"""
+    step = period * rule['interval']
+    freq = rule['freq']
+    if freq == 'DAILY':
+        return [start + timedelta(days=step)]
+    if freq == 'WEEKLY':
+        if not rule['byday']:
+            return [start + timedelta(weeks=step)]
+        week_start = start - timedelta(days=start.weekday()) + timedelta(weeks=step)
+        return [
+            week_start + timedelta(days=day) for day in rule['byday']
+            if week_start + timedelta(days=day) >= start
+        ]
+    if freq == 'MONTHLY':
+        value = _add_months(start, step)
+    else:
+        value = _add_months(start, step * 12)
+    return [value] if value else []
+
+def _first_period(start, rule, window_start):
+    """Index of a period at or before the one containing window_start, so expansion can skip ahead"""
+    if rule['count'] is not None or window_start <= start:
+        # COUNT has to be counted from the first occurrence
+        return 0
+    if rule['freq'] == 'DAILY':
+        length = timedelta(days=rule['interval'])
+    elif rule['freq'] == 'WEEKLY':
+        length = timedelta(weeks=rule['interval'])
+    elif rule['freq'] == 'MONTHLY':
+        months = (window_start.year - start.year) * 12 + window_start.month - start.month
+        return max(0, months // rule['interval'] - 1)
+    else:
+        return max(0, (window_start.year - start.year) // rule['interval'] - 1)
+    return max(0, (window_start - start) // length - 1)
+
+def occurrences(start, rule, window_start, window_end):
+    """
+    Yield the start of every occurrence with window_start <= date < window_end,
+    in order, without generating the ones before the window.
+    """
+    if isinstance(rule, str):
+        rule = parse_rule(rule)
+    produced = 0
+    seen = 0
+    period = _first_period(start, rule, window_start)
+    while produced < MAX_EXPANSION:
+        batch = _period_occurrences(start, rule, period)
+        period += 1
+        if not batch:
+            if period > MAX_COUNT * 12:
+                return
+            continue
+        for value in batch:
+            seen += 1
+            if rule['count'] is not None and seen > rule['count']:
+                return
+            if rule['until'] is not None and value > rule['until']:
+                return
+            if value >= window_end:
+                return
+            if value >= window_start:
+                produced += 1
+                yield value
+
+def last_occurrence(start, rule):
+    """Start of the final occurrence, or None for open-ended rules"""
+    if isinstance(rule, str):
+        rule = parse_rule(rule)
+    if rule['until'] is not None:
+        return rule['until']
+    if rule['count'] is None:
+        return None
+    last = start
+    for last in occurrences(start, rule, start, datetime.max):
+        pass
+    return last
+
+def is_occurrence(start, rule, value):
+    """Whether ``value`` is one of the rule's scheduled starts"""
+    return any(found == value for found in occurrences(start, rule, value, value + timedelta(microseconds=1)))
+
+def set_rule(event, rule):
+    """Validate and store a recurrence rule on ``event``; a falsy rule makes it a single event"""
+    if not rule:
+        event.recurrence_rule = None
+        event.recurrence_end = None
+        return
+    if not isinstance(rule, str) or len(rule) > 255:
+        raise ValueError('Recurrence rule must be a string of at most 255 characters')
+    parsed = parse_rule(rule)
+    event.recurrence_rule = format_rule(parsed)
+    event.recurrence_end = last_occurrence(event.date, parsed)
+
+# One expanded occurrence: the series row, its (possibly moved) start, the
+# start the rule scheduled, and the override row if the occurrence was edited
+Occurrence = namedtuple('Occurrence', 'event date original_date override')
+
+def active_series(query, window_start, window_end):
+    """Narrow an Event query to recurring events with occurrences that can fall in the window"""
+    return query.filter(
+        Event.recurrence_rule.isnot(None),
+        Event.date < window_end,
+        or_(Event.recurrence_end.is_(None), Event.recurrence_end >= window_start)
+    )
+
+def expand(series, window_start, window_end):
+    """
+    Occurrences of the recurring ``series`` rows starting in the window,
+    ordered by (date, event id). Only the window is expanded; overrides for
+    all series are fetched with one query and applied on top.
+    """
+    if not series:
+        return []
+    overrides = {
+        (override.event_id, override.original_date): override
+        for override in EventOccurrence.query.filter(
+            EventOccurrence.event_id.in_([event.id for event in series]),
+            or_(
+                and_(EventOccurrence.original_date >= window_start, EventOccurrence.original_date < window_end),
+                and_(EventOccurrence.date >= window_start, EventOccurrence.date < window_end)
+            )
+        )
+    }
+    by_id = {event.id: event for event in series}
+    
+    found = []
+    for event in series:
+        for original in occurrences(event.date, event.recurrence_rule, window_start, window_end):
+            found.append(Occurrence(event, original, original, overrides.pop((event.id, original), None)))
+    # Occurrences moved into the window from outside it
+    for (event_id, original), override in overrides.items():
+        if not window_start <= original < window_end:
+            found.append(Occurrence(by_id[event_id], original, original, override))
+    
+    result = []
+    for occurrence in found:
+        override = occurrence.override
+        if override is not None:
+            if override.cancelled:
+                continue
+            occurrence = occurrence._replace(date=override.date or occurrence.original_date)
+            if not window_start <= occurrence.date < window_end:
+                continue
+        result.append(occurrence)
+    result.sort(key=lambda occurrence: (occurrence.date, occurrence.event.id))
+    return result
+
+def occurrence_dict(data, occurrence):
+    """Adapt a serialized series (``data``) to one occurrence of it"""
+    data = dict(data)
+    if 'date' in data:
+        data['date'] = occurrence.date.isoformat()
+    override = occurrence.override
+    if override is not None:
+        for name in ('title', 'description', 'location'):
+            if name in data and getattr(override, name) is not None:
+                data[name] = getattr(override, name)
+    data['original_date'] = occurrence.original_date.isoformat()
+    return data
+
+def merge_page(events, more_events, expanded, limit, cursor=None, descending=False):
+    """
+    Merge one keyset page of single events with expanded occurrences into at
+    most ``limit`` (event, occurrence or None) items ordered by (date, id),
+    plus the cursor for the next page. Occurrences share their series id, but
+    a series has at most one occurrence per date, so (date, id) stays unique.
+    """
+    def key(item):
+        event, occurrence = item
+        return (occurrence.date if occurrence else event.date, event.id)
+    
+    items = [(event, None) for event in events]
+    for occurrence in expanded:
+        position = (occurrence.date, occurrence.event.id)
+        if cursor is None or (position < cursor if descending else position > cursor):
+            items.append((occurrence.event, occurrence))
+    items.sort(key=key, reverse=descending)
+    
+    more = more_events or len(items) > limit
+    items = items[:limit]
+    next_cursor = encode_cursor(*key(items[-1])) if more and items else None
+    return items, next_cursor
@@ -0,0 +1,92 @@
+# backend/app/services/retention.py
+from datetime import datetime, timedelta
+from sqlalchemy import and_, delete, false, func, insert, literal, or_, select, true
+from app import db
+from app.models import ChangeLog, Notification, NotificationArchive
+from app.services.changes import PRUNE_SLACK, record_changes
+from app.versioning import bump_users
+
+# Columns copied from notification to notification_archive
+ARCHIVED_COLUMNS = ('id', 'user_id', 'type', 'title', 'message', 'related_id', 'read', 'count', 'created_at')
+
+def expired_notifications(read_ttl_days, unread_ttl_days, now):
+    """Condition matching notifications past their retention period; None if nothing expires"""
+    conditions = []
+    if read_ttl_days:
+        conditions.append(and_(
+            Notification.read == true(),
+            Notification.created_at < now - timedelta(days=read_ttl_days)
+        ))
+    if unread_ttl_days:
+        # read is nullable; rows that never had it set count as unread
+        conditions.append(and_(
+            or_(Notification.read == false(), Notification.read.is_(None)),
+            Notification.created_at < now - timedelta(days=unread_ttl_days)
+        ))
+    return or_(*conditions) if conditions else None
+
+def archive_notifications(read_ttl_days, unread_ttl_days, batch_size, on_batch=None):
+    """
+    Move expired notifications to notification_archive, one batch per
+    transaction so no lock is held for long. Calls on_batch with
+    each batch's size and returns the total number of rows moved.
+    """
+    now = datetime.utcnow()
+    expired = expired_notifications(read_ttl_days, unread_ttl_days, now)
+    if expired is None:
+        return 0
+    
+    # SQLite hands out max(id) + 1 and would reuse the newest id once it is
+    # gone; that id is already archived and behind every stream's cursor
+    newest = select(func.max(Notification.id)).scalar_subquery()
+    moved = 0
+    while True:
+        rows = db.session.execute(
+            select(Notification.id, Notification.user_id).where(expired, Notification.id < newest).limit(batch_size)
+        ).all()
+        if not rows:
+            return moved
+        ids = [row.id for row in rows]
+        
+        columns = [getattr(Notification, name) for name in ARCHIVED_COLUMNS]
+        db.session.execute(insert(NotificationArchive).from_select(
+            [*ARCHIVED_COLUMNS, 'archived_at'],
+            select(*columns, literal(now)).where(Notification.id.in_(ids))
+        ))
+        db.session.execute(delete(Notification).where(Notification.id.in_(ids)))
+        # Clients drop the rows on their next sync and stop reusing stale ETags
+        record_changes([{'entity': 'notifications', 'entity_id': row.id, 'op': 'delete', 'user_id': row.user_id} for row in rows])
+        bump_users(*{row.user_id for row in rows})
+        db.session.commit()
+        
+        moved += len(ids)
+        if on_batch:
+            on_batch(len(ids))
+
+def prune_change_log(ttl_days, batch_size, on_batch=None):
+    """
+    Delete change_log rows no valid sync cursor can still need, one batch per
+    transaction. Calls on_batch with each batch's size and returns the total
+    number of rows deleted.
+    """
+    if not ttl_days:
+        return 0
+    cutoff = datetime.utcnow() - timedelta(days=ttl_days) - PRUNE_SLACK
+    # Keep the newest row: SQLite would reuse its id, and clients whose
+    # cursor sits at it would skip new changes until the ids passed it
+    newest = select(func.max(ChangeLog.id)).scalar_subquery()
+    
+    deleted = 0
+    while True:
+        ids = db.session.scalars(
+            select(ChangeLog.id).where(ChangeLog.created_at < cutoff, ChangeLog.id < newest).limit(batch_size)
+        ).all()
+        if not ids:
+            return deleted
+        
+        db.session.execute(delete(ChangeLog).where(ChangeLog.id.in_(ids)))
+        db.session.commit()
+        
+        deleted += len(ids)
+        if on_batch:
+            on_batch(len(ids))
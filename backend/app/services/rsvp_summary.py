@@ -0,0 +1,28 @@
+# backend/app/services/rsvp_summary.py
+from sqlalchemy import func
+from app import db
+from app.cache import LRUCache
+from app.models import RSVP
+
+# event_id -> (event.version, summary). Entries are stored with the version
+# they were computed at, so a write seen through another worker's version
+# bump is never served stale; local RSVP writes also drop the entry outright.
+summaries = LRUCache(maxsize=4096)
+
+def rsvp_summary(event_id, version):
+    """Status counts for an event's RSVPs, from the cache when the event is unchanged"""
+    cached = summaries.get(event_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    
+    counts = dict.fromkeys(RSVP.STATUSES, 0)
+    rows = db.session.query(RSVP.status, func.count()).filter(RSVP.event_id == event_id).group_by(RSVP.status)
+    for status, count in rows:
+        counts[status] = count
+    summary = {'event_id': event_id, 'counts': counts, 'total': sum(counts.values())}
+    summaries.set(event_id, (version, summary))
+    return summary
+
+def invalidate(event_id):
+    """Forget an event's cached summary after its RSVPs change"""
+    summaries.pop(event_id)
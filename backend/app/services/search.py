@@ -0,0 +1,71 @@
+# backend/app/services/search.py
+import re
+from sqlalchemy import Double, bindparam, cast, column, func, literal_column, select, table, text
+from app import db
+from app.models import Event
+
+# SQLite keeps the index in an FTS5 table whose rowid is the event id;
+# PostgreSQL keeps it in a tsvector column on event with a GIN index.
+# Neither is mapped on the model, see the DDL hooks at the end of models.py.
+FTS_TABLE = 'event_fts'
+
+# Relative weight of title, description and location matches
+SQLITE_WEIGHTS = (10.0, 1.0, 2.0)
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B')"
+)
+
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+def index_events(event_ids):
+    """(Re)build the search entries of the given events inside the current transaction"""
+    if not event_ids:
+        return
+    ids = bindparam('ids', value=list(event_ids), expanding=True)
+    if _dialect() == 'postgresql':
+        db.session.execute(
+            text(f'UPDATE event SET search_vector = {POSTGRES_VECTOR} WHERE id IN :ids').bindparams(ids)
+        )
+    else:
+        db.session.execute(text(f'DELETE FROM {FTS_TABLE} WHERE rowid IN :ids').bindparams(ids))
+        db.session.execute(text(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description, location) '
+            f'SELECT id, title, description, location FROM event WHERE id IN :ids'
+        ).bindparams(ids))
+
+def unindex_events(event_ids):
+    """Drop the search entries of events that are being deleted"""
+    if not event_ids or _dialect() == 'postgresql':
+        # The tsvector goes away with the row
+        return
+    ids = bindparam('ids', value=list(event_ids), expanding=True)
+    db.session.execute(text(f'DELETE FROM {FTS_TABLE} WHERE rowid IN :ids').bindparams(ids))
+
+def search_terms(q):
+    """Split a user query into plain word terms, dropping search syntax"""
+    return re.findall(r'\w+', q or '')
+
+def ranked_matches(terms):
+    """
+    Subquery of (id, rank) for events matching every term, each term also
+    matching as a prefix. Lower rank is a better match on both backends.
+    """
+    if _dialect() == 'postgresql':
+        tsquery = func.to_tsquery('english', ' & '.join(f'{term}:*' for term in terms))
+        vector = literal_column('event.search_vector')
+        # ts_rank is a real; as double precision the rank written into the
+        # page cursor compares equal when it is read back
+        return select(
+            Event.id.label('id'),
+            (-cast(func.ts_rank(vector, tsquery), Double)).label('rank')
+        ).where(vector.op('@@')(tsquery)).subquery()
+    
+    fts = table(FTS_TABLE, column('rowid'))
+    match = ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+    return select(
+        fts.c.rowid.label('id'),
+        func.bm25(literal_column(FTS_TABLE), *SQLITE_WEIGHTS).label('rank')
+    ).where(literal_column(FTS_TABLE).op('MATCH')(match)).subquery()
@@ -1,37 +1,235 @@
 # backend/app/utils.py
+import base64
+import binascii
+import json
+import logging
+from collections import namedtuple
+from datetime import datetime, timezone
 from functools import wraps
-from flask import jsonify
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, jwt_required
+from urllib.parse import urlencode
+from flask import jsonify, request
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, get_jwt, create_access_token, jwt_required
+from sqlalchemy import and_, or_
+from app import db
+from app.cache import LRUCache
 from app.models import User
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+logger = logging.getLogger(__name__)
+
+# Users returned by get_current_user, per worker process. Changes made through
+# this worker invalidate their entry at once; the TTL bounds how long other
+# workers can serve a stale copy
+user_cache = LRUCache(10000, ttl=60)
+
+# The authenticated user as carried by the JWT claims
+Identity = namedtuple('Identity', ['id', 'username'])
+
+# Requests that change data must come from a user who still exists; reads
+# trust the token's claims alone
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
 def jwt_required_custom(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         try:
-            from flask import request
-            print(f"JWT Auth attempt for {request.method} {request.path}")
-            auth_header = request.headers.get('Authorization')
-            print(f"Authorization header: {auth_header}")
-            
             verify_jwt_in_request()
-            user_id_str = get_jwt_identity()
-            print(f"JWT verified successfully for user ID: {user_id_str}")
-            return f(*args, **kwargs)
         except Exception as e:
-            print(f"JWT verification failed: {e}")
+            logger.info('JWT verification failed: %s', e, extra={'method': request.method, 'path': request.path})
             return jsonify({'message': 'Invalid or missing token'}), 401
+        logger.debug('JWT verified', extra={'method': request.method, 'path': request.path, 'user_id': get_jwt_identity()})
+        if request.method in WRITE_METHODS and not current_user_exists():
+            return jsonify({'message': 'User not found'}), 404
+        # Outside the try: errors in the route reach Flask's error handling
+        # (and their errorhandlers) instead of passing for a bad token
+        return f(*args, **kwargs)
     return decorated_function
 
-def get_current_user():
+def access_token_for(user):
+    """JWT for user, carrying the claims routes read instead of loading the user"""
+    return create_access_token(identity=str(user.id), additional_claims={'username': user.username})
+
+def get_current_user_id():
+    """The authenticated user's id, read from the JWT without touching the database"""
     try:
-        user_id_str = get_jwt_identity()
-        # Convert string back to integer for database query
-        user_id = int(user_id_str)
-        return User.query.get(user_id)
-    except (ValueError, TypeError, AttributeError) as e:
-        print(f"Error converting user ID: {e}")
+        return int(get_jwt_identity())
+    except (ValueError, TypeError) as e:
+        logger.warning('Invalid user id in JWT: %s', e)
+        return None
+
+def current_user_exists():
+    """
+    Whether the authenticated user still exists. A primary key lookup that
+    bypasses the cache: a deleted account's tokens stay valid until they
+    expire, and another worker may still hold the user.
+    """
+    user_id = get_current_user_id()
+    return user_id is not None and db.session.query(User.id).filter_by(id=user_id).first() is not None
+
+def get_current_identity():
+    """Identity(id, username) of the authenticated user, from the JWT claims"""
+    user_id = get_current_user_id()
+    if user_id is None:
         return None
-    except Exception as e:
-        print(f"Error getting current user: {e}")
+    username = get_jwt().get('username')
+    if username is None:
+        # Token issued before usernames were added to the claims
+        user = get_current_user()
+        return Identity(user.id, user.username) if user else None
+    return Identity(user_id, username)
+
+def get_current_user():
+    """
+    The authenticated User, from the per-worker cache when possible.
+    
+    The instance is detached and shared between requests: read it, but load
+    the user with load_current_user() to change it.
+    """
+    user_id = get_current_user_id()
+    if user_id is None:
         return None
-        
\ No newline at end of file
+    user = user_cache.get(user_id)
+    if user is None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        db.session.expunge(user)
+        user_cache.set(user_id, user)
+    return user
+
+def load_current_user():
+    """The authenticated User attached to the session, for routes that change it"""
+    user_id = get_current_user_id()
+    return db.session.get(User, user_id) if user_id is not None else None
+
+def invalidate_user(user_id):
+    """Drop the user from this worker's cache after changing or deleting it"""
+    user_cache.pop(user_id)
+
+def parse_event_date(date_str):
+    """
+    Parse an event date as sent by the frontend, raising ValueError/TypeError
+    if invalid. Event dates are stored as naive UTC: values with an offset
+    are converted, values without one (datetime-local inputs) are taken as UTC.
+    """
+    # Handle different date formats
+    if 'T' in date_str and not date_str.endswith('Z'):
+        # datetime-local format from HTML input
+        value = datetime.fromisoformat(date_str)
+    elif date_str.endswith('Z'):
+        # ISO format with Z
+        value = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    else:
+        # Try parsing as-is
+        value = datetime.fromisoformat(date_str)
+    if value.tzinfo:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def parse_fieldset(model, extra_fields=()):
+    """
+    Read ?fields= and ?include= for a model's to_dict().
+    
+    Returns (fields, include) where fields is None when the client wants the
+    default shape. Raises ValueError on names the model does not know.
+    """
+    fields = None
+    if request.args.get('fields'):
+        fields = {name.strip() for name in request.args['fields'].split(',') if name.strip()}
+        unknown = fields - set(model.field_sources) - set(extra_fields)
+        if unknown:
+            raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}')
+    
+    include = set()
+    if request.args.get('include'):
+        include = {name.strip() for name in request.args['include'].split(',') if name.strip()}
+        unknown = include - set(model.include_sources)
+        if unknown:
+            raise ValueError(f'Unknown include: {", ".join(sorted(unknown))}')
+    return fields, include
+
+def encode_cursor(sort_value, row_id):
+    """Encode the (sort value, id) of the last row on a page as an opaque cursor"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, parse=datetime.fromisoformat):
+    """Decode a cursor produced by encode_cursor, raising ValueError if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return parse(sort_value), int(row_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError('Invalid cursor')
+
+def get_page_limit():
+    """Read ?limit= from the request, clamped to MAX_PAGE_SIZE"""
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except (ValueError, TypeError):
+        raise ValueError('Limit must be an integer')
+    if limit < 1:
+        raise ValueError('Limit must be positive')
+    return min(limit, MAX_PAGE_SIZE)
+
+def keyset_page(query, sort_column, id_column, descending=False, key=None, parse=datetime.fromisoformat):
+    """
+    Return one page of ``query`` ordered by (sort_column, id_column) and the
+    cursor for the next page (None on the last page).
+
+    The page boundary is a WHERE clause on the last seen (sort value, id) pair
+    rather than an OFFSET, so every page is an index seek of the same cost.
+    ``key`` extracts that pair from a result row when rows are not plain
+    instances of the sorted model (e.g. joined tuples), and ``parse`` turns
+    the sort value back into its Python type when the cursor is read.
+    """
+    limit = get_page_limit()
+    cursor = request.args.get('cursor')
+    
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, parse)
+        if descending:
+            query = query.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id)
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > row_id)
+            ))
+    
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if key is None:
+            last = rows[-1]
+            next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+        else:
+            next_cursor = encode_cursor(*key(rows[-1]))
+    return rows, next_cursor
+
+def paginated_response(items, next_cursor):
+    """
+    JSON list response for one page. The body stays a plain list so existing
+    clients keep working; the next page is advertised in X-Next-Cursor and a
+    Link header.
+    """
+    response = jsonify(items)
+    if next_cursor:
+        args = request.args.to_dict()
+        args['cursor'] = next_cursor
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+    return response
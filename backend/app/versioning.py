@@ -0,0 +1,93 @@
+# backend/app/versioning.py
+import hashlib
+from datetime import datetime
+from flask import request, current_app
+from sqlalchemy import select, union
+from app import db
+from app.models import User, Event, Invite, RSVP
+
+def bump_users(*user_ids):
+    """Invalidate the cached lists of the given users"""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    User.query.filter(User.id.in_(user_ids)).update(
+        {User.data_version: User.data_version + 1, User.data_updated_at: datetime.utcnow()},
+        synchronize_session=False
+    )
+
+def user_version(user_id):
+    """The user's data_version, read without loading the user; None if they no longer exist"""
+    return db.session.query(User.data_version).filter_by(id=user_id).scalar()
+
+def event_audience(event_id):
+    """Subquery of the ids of every user who can see the event in one of their lists"""
+    return union(
+        select(Event.user_id).where(Event.id == event_id),
+        select(Invite.invitee_id).where(Invite.event_id == event_id, Invite.invitee_id.isnot(None)),
+        select(Invite.inviter_id).where(Invite.event_id == event_id),
+    )
+
+def bump_event(event_id):
+    """Invalidate an event's own version and the lists of everyone who can see it"""
+    Event.query.filter_by(id=event_id).update(
+        {Event.version: Event.version + 1},
+        synchronize_session=False
+    )
+    User.query.filter(User.id.in_(event_audience(event_id))).update(
+        {User.data_version: User.data_version + 1, User.data_updated_at: datetime.utcnow()},
+        synchronize_session=False
+    )
+
+def bump_user_references(user_id):
+    """Invalidate everything that displays the user's username to other users"""
+    rsvp_events = select(RSVP.event_id).where(RSVP.user_id == user_id)
+    Event.query.filter(
+        (Event.user_id == user_id) | Event.id.in_(rsvp_events)
+    ).update({Event.version: Event.version + 1}, synchronize_session=False)
+    
+    related_users = union(
+        select(Invite.invitee_id).where(Invite.inviter_id == user_id, Invite.invitee_id.isnot(None)),
+        select(Invite.inviter_id).where(Invite.invitee_id == user_id),
+        select(Invite.invitee_id).where(
+            Invite.event_id.in_(select(Event.id).where(Event.user_id == user_id)),
+            Invite.invitee_id.isnot(None)
+        ),
+    )
+    User.query.filter((User.id == user_id) | User.id.in_(related_users)).update(
+        {User.data_version: User.data_version + 1, User.data_updated_at: datetime.utcnow()},
+        synchronize_session=False
+    )
+
+def make_etag(*versions):
+    """
+    Strong ETag for the current request at the given versions.
+    
+    The path and query string are part of the tag, so each endpoint and page
+    gets its own validator from the same version counters.
+    """
+    key = '|'.join([request.full_path] + [str(version) for version in versions])
+    return hashlib.sha1(key.encode()).hexdigest()
+
+def not_modified(etag, last_modified=None):
+    """
+    Return a 304 response if the client already holds ``etag`` (or, when it
+    sent no If-None-Match, a copy from ``last_modified`` or later), else None.
+    """
+    if request.if_none_match:
+        if not request.if_none_match.contains(etag):
+            return None
+    elif last_modified is None or request.if_modified_since is None:
+        return None
+    elif last_modified.replace(microsecond=0) > request.if_modified_since.replace(tzinfo=None):
+        return None
+    response = current_app.response_class(status=304)
+    return with_etag(response, etag, last_modified)
+
+def with_etag(response, etag, last_modified=None):
+    """Attach ``etag`` and make browsers revalidate it on every use"""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified.replace(microsecond=0)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
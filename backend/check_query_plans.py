@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Query plan regression check for the list endpoints.
+
+Seeds a scratch database, calls every list endpoint, captures the SELECT
+statements they issue and runs EXPLAIN (EXPLAIN QUERY PLAN on SQLite) on each
+one. Exits with status 1 if any of them falls back to a full table scan.
+
+    cd backend && python check_query_plans.py
+
+Uses an in-memory SQLite database by default. Set QUERY_PLAN_DATABASE_URL to
+check a scratch PostgreSQL database instead - its tables are dropped and
+recreated, so never point it at real data.
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Must be set before the app (and Config) is imported
+os.environ['DATABASE_URL'] = os.environ.get('QUERY_PLAN_DATABASE_URL', 'sqlite://')
+
+from sqlalchemy import event as sa_event
+from app import create_app, db
+from app.models import User, Event, Task, RSVP, Invite, Notification
+from app.services.search import index_events
+from app.services.ical import make_feed_token
+from app.services.recurrence import set_rule
+from app.utils import access_token_for, encode_cursor
+
+# (owner or invitee, URL) for every list endpoint in app/routes; 'feed'
+# endpoints authenticate with the token in their URL instead of a JWT
+LIST_ENDPOINTS = [
+    ('owner', '/api/events'),
+    ('owner', '/api/events/past'),
+    ('invitee', '/api/events/invited'),
+    ('owner', '/api/events/search?q=upcoming'),
+    ('invitee', '/api/events/range?start={start}&end={end}'),
+    ('feed', '/api/events/feed.ics?token={feed_token}'),
+    ('owner', '/api/tasks/event/{event_id}'),
+    ('owner', '/api/rsvps/event/{event_id}'),
+    ('owner', '/api/rsvps/event/{event_id}/summary'),
+    ('invitee', '/api/invites'),
+    ('owner', '/api/invites/sent'),
+    ('owner', '/api/invites/sent/summary'),
+    ('owner', '/api/invites/sent/event/{event_id}'),
+    ('owner', '/api/rsvps/notifications'),
+    ('owner', '/api/rsvps/notifications/unread-count'),
+    ('invitee', '/api/sync?since={sync_cursor}'),
+]
+
+def seed():
+    owner = User(username='plan_owner', email='plan_owner@example.com')
+    invitee = User(username='plan_invitee', email='plan_invitee@example.com')
+    owner.set_password('password')
+    invitee.set_password('password')
+    db.session.add_all([owner, invitee])
+    db.session.flush()
+    
+    now = datetime.utcnow()
+    upcoming = Event(title='Upcoming', date=now + timedelta(days=7), user_id=owner.id)
+    past = Event(title='Past', date=now - timedelta(days=7), user_id=owner.id)
+    weekly = Event(title='Weekly', date=now - timedelta(days=14), user_id=owner.id)
+    set_rule(weekly, 'FREQ=WEEKLY')
+    db.session.add_all([upcoming, past, weekly])
+    db.session.flush()
+    index_events([upcoming.id, past.id, weekly.id])
+    
+    db.session.add_all([
+        Task(title='Book venue', event_id=upcoming.id),
+        RSVP(user_id=invitee.id, event_id=upcoming.id, status='Going'),
+        Invite(event_id=upcoming.id, inviter_id=owner.id, invitee_email=invitee.email, invitee_id=invitee.id),
+        Notification(user_id=owner.id, type='rsvp_new', title='New RSVP', message=''),
+    ])
+    db.session.commit()
+    return owner, invitee, upcoming
+
+def full_scans(connection, statement, parameters):
+    """Return the plan lines of ``statement`` that scan a whole table"""
+    if connection.dialect.name == 'sqlite':
+        rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+        details = [row[-1] for row in rows]
+        # FTS5 lookups show up as 'SCAN <table> VIRTUAL TABLE INDEX ...'
+        return [
+            d for d in details
+            if d.startswith('SCAN ') and 'USING' not in d and 'VIRTUAL TABLE' not in d and 'CONSTANT ROW' not in d
+        ]
+    
+    # Small tables always look cheaper to scan, so make the planner prefer any usable index
+    connection.exec_driver_sql('SET enable_seqscan = off')
+    rows = connection.exec_driver_sql('EXPLAIN ' + statement, parameters).fetchall()
+    return [row[0].strip() for row in rows if 'Seq Scan' in row[0]]
+
+def main():
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        owner, invitee, event = seed()
+        headers = {
+            'owner': {'Authorization': f'Bearer {access_token_for(owner)}'},
+            'invitee': {'Authorization': f'Bearer {access_token_for(invitee)}'},
+            'feed': {},
+        }
+        feed_token = make_feed_token(invitee)
+        event_id = event.id
+        range_start = event.date.date().isoformat()
+        range_end = (event.date + timedelta(days=1)).date().isoformat()
+        engine = db.engine
+    
+    captured = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            captured.append((statement, parameters))
+    
+    # Requests run outside the seeding app context so nothing is served from
+    # its identity map and every lazy load shows up as a statement
+    client = app.test_client()
+    failures = 0
+    for role, url in LIST_ENDPOINTS:
+        url = url.format(event_id=event_id, start=range_start, end=range_end, feed_token=feed_token, sync_cursor=encode_cursor([0, datetime.utcnow().isoformat()], 0))
+        captured.clear()
+        sa_event.listen(engine, 'before_cursor_execute', capture)
+        try:
+            # Buffer so streamed bodies run their queries while we are listening
+            response = client.get(url, headers=headers[role], buffered=True)
+        finally:
+            sa_event.remove(engine, 'before_cursor_execute', capture)
+        
+        if response.status_code != 200:
+            print(f'FAIL {url}: HTTP {response.status_code}')
+            failures += 1
+            continue
+        
+        problems = []
+        with engine.connect() as connection:
+            for statement, parameters in captured:
+                scans = full_scans(connection, statement, parameters)
+                if scans:
+                    problems.append(f'{"; ".join(scans)}\n    {" ".join(statement.split())}')
+        
+        if problems:
+            failures += len(problems)
+            for problem in problems:
+                print(f'FAIL {url}: full table scan: {problem}')
+        else:
+            print(f'ok   {url} ({len(captured)} statements)')
+    
+    with app.app_context():
+        db.drop_all()
+    
+    if failures:
+        print(f'{failures} problem(s) found')
+        return 1
+    print('All list queries use indexes')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -45,6 +45,20 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Leave the full-text search index out of autogenerate: migration
+    61cb6fc981fe creates it in raw SQL (event_fts* on SQLite, the
+    search_vector column and its GIN index on PostgreSQL), so the models
+    do not declare it and it would otherwise be proposed for dropping.
+    """
+    if type_ == 'table' and name.startswith('event_fts'):
+        return False
+    if reflected and compare_to is None and name in ('search_vector', 'ix_event_search_vector'):
+        return False
+    return True
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -65,7 +79,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +108,8 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
@@ -0,0 +1,27 @@
+"""Add indexes for the sent-invite rollup and per-event drill-in
+
+Revision ID: 1e2e6b771364
+Revises: efaa37ae7848
+Create Date: 2026-10-18 15:48:52.106334
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '1e2e6b771364'
+down_revision = 'efaa37ae7848'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_invite_inviter_id', table_name='invite')
+    op.create_index('ix_invite_inviter_id_event_id_status', 'invite', ['inviter_id', 'event_id', 'status'], unique=False)
+    op.create_index('ix_invite_event_id_created_at', 'invite', ['event_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_invite_event_id_created_at', table_name='invite')
+    op.drop_index('ix_invite_inviter_id_event_id_status', table_name='invite')
+    op.create_index('ix_invite_inviter_id', 'invite', ['inviter_id'], unique=False)
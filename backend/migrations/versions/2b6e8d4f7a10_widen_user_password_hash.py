@@ -0,0 +1,32 @@
+"""Widen user.password_hash for scrypt hashes
+
+Revision ID: 2b6e8d4f7a10
+Revises: 8e4d0b7a2c95
+Create Date: 2026-10-18 21:02:37.905114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b6e8d4f7a10'
+down_revision = '8e4d0b7a2c95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.VARCHAR(length=120),
+               type_=sa.String(length=255),
+               existing_nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=255),
+               type_=sa.VARCHAR(length=120),
+               existing_nullable=False)
@@ -0,0 +1,33 @@
+"""Add indexes for the list query filters
+
+Revision ID: 2ca07fd7c964
+Revises: 517282560784
+Create Date: 2026-10-18 10:03:17.540921
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '2ca07fd7c964'
+down_revision = '517282560784'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_event_user_id_date', 'event', ['user_id', 'date'], unique=False)
+    op.create_index('ix_invite_invitee_id', 'invite', ['invitee_id'], unique=False)
+    op.create_index('ix_invite_inviter_id', 'invite', ['inviter_id'], unique=False)
+    op.create_index('ix_notification_user_id_created_at', 'notification', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_task_event_id', 'task', ['event_id'], unique=False)
+    op.create_index('ix_rsvp_event_id', 'rsvp', ['event_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_rsvp_event_id', table_name='rsvp')
+    op.drop_index('ix_task_event_id', table_name='task')
+    op.drop_index('ix_notification_user_id_created_at', table_name='notification')
+    op.drop_index('ix_invite_inviter_id', table_name='invite')
+    op.drop_index('ix_invite_invitee_id', table_name='invite')
+    op.drop_index('ix_event_user_id_date', table_name='event')
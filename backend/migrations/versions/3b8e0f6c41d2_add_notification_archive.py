@@ -0,0 +1,39 @@
+"""Add the notification archive table and retention index
+
+Revision ID: 3b8e0f6c41d2
+Revises: d453a4bb4dcd
+Create Date: 2026-10-18 18:02:13.684207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8e0f6c41d2'
+down_revision = 'd453a4bb4dcd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notification_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('related_id', sa.Integer(), nullable=True),
+    sa.Column('read', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_notification_archive_user_id_created_at', 'notification_archive', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_notification_read_created_at', 'notification', ['read', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_notification_read_created_at', table_name='notification')
+    op.drop_index('ix_notification_archive_user_id_created_at', table_name='notification_archive')
+    op.drop_table('notification_archive')
@@ -0,0 +1,26 @@
+"""Add a feed token version to users
+
+Revision ID: 4f7a2d9c1e63
+Revises: 2b6e8d4f7a10
+Create Date: 2026-10-18 21:05:12.418093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f7a2d9c1e63'
+down_revision = '2b6e8d4f7a10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('feed_token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('feed_token_version')
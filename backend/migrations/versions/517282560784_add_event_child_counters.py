@@ -0,0 +1,35 @@
+"""Add tasks_count and rsvps_count counters to event
+
+Revision ID: 517282560784
+Revises: a8425ab8fc65
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '517282560784'
+down_revision = 'a8425ab8fc65'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('tasks_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rsvps_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the child tables
+    op.execute(
+        'UPDATE event SET '
+        'tasks_count = (SELECT COUNT(*) FROM task WHERE task.event_id = event.id), '
+        'rsvps_count = (SELECT COUNT(*) FROM rsvp WHERE rsvp.event_id = event.id)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_column('rsvps_count')
+        batch_op.drop_column('tasks_count')
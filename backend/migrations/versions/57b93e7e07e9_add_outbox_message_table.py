@@ -0,0 +1,36 @@
+"""Add the transactional outbox table
+
+Revision ID: 57b93e7e07e9
+Revises: 1e2e6b771364
+Create Date: 2026-10-18 16:31:40.552918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '57b93e7e07e9'
+down_revision = '1e2e6b771364'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('outbox_message',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('topic', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('available_at', sa.DateTime(), nullable=False),
+    sa.Column('claim_token', sa.String(length=32), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_message_available_at', 'outbox_message', ['available_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_outbox_message_available_at', table_name='outbox_message')
+    op.drop_table('outbox_message')
@@ -0,0 +1,46 @@
+"""Add full-text search index for events
+
+Revision ID: 61cb6fc981fe
+Revises: 6d5d23733403
+Create Date: 2026-10-18 12:41:08.662310
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '61cb6fc981fe'
+down_revision = '6d5d23733403'
+branch_labels = None
+depends_on = None
+
+# Must match POSTGRES_VECTOR in app/services/search.py
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B')"
+)
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ALTER TABLE event ADD COLUMN search_vector tsvector')
+        op.execute(f'UPDATE event SET search_vector = {POSTGRES_VECTOR}')
+        op.execute('CREATE INDEX ix_event_search_vector ON event USING GIN (search_vector)')
+    else:
+        op.execute(
+            "CREATE VIRTUAL TABLE event_fts "
+            "USING fts5(title, description, location, tokenize='porter unicode61')"
+        )
+        op.execute(
+            'INSERT INTO event_fts (rowid, title, description, location) '
+            'SELECT id, title, description, location FROM event'
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX ix_event_search_vector')
+        op.execute('ALTER TABLE event DROP COLUMN search_vector')
+    else:
+        op.execute('DROP TABLE event_fts')
@@ -0,0 +1,32 @@
+"""Add user.data_version and event.version for conditional GETs
+
+Revision ID: 6d5d23733403
+Revises: 2ca07fd7c964
+Create Date: 2026-10-18 11:26:54.307719
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d5d23733403'
+down_revision = '2ca07fd7c964'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_column('version')
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('data_version')
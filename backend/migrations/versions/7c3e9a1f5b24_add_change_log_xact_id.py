@@ -0,0 +1,36 @@
+"""Order the change log by writing transaction and index it for pruning
+
+Revision ID: 7c3e9a1f5b24
+Revises: 4f7a2d9c1e63
+Create Date: 2026-10-18 22:14:37.602915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e9a1f5b24'
+down_revision = '4f7a2d9c1e63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('change_log', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('xact_id', sa.BigInteger(), server_default='0', nullable=False))
+        batch_op.drop_index('ix_change_log_user_id_id')
+        batch_op.drop_index('ix_change_log_event_id_id')
+        batch_op.create_index('ix_change_log_user_id_xact_id_id', ['user_id', 'xact_id', 'id'], unique=False)
+        batch_op.create_index('ix_change_log_event_id_xact_id_id', ['event_id', 'xact_id', 'id'], unique=False)
+        batch_op.create_index('ix_change_log_created_at', ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('change_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_change_log_created_at')
+        batch_op.drop_index('ix_change_log_event_id_xact_id_id')
+        batch_op.drop_index('ix_change_log_user_id_xact_id_id')
+        batch_op.create_index('ix_change_log_event_id_id', ['event_id', 'id'], unique=False)
+        batch_op.create_index('ix_change_log_user_id_id', ['user_id', 'id'], unique=False)
+        batch_op.drop_column('xact_id')
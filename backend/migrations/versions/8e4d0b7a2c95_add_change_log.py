@@ -0,0 +1,37 @@
+"""Add the change log read by delta sync
+
+Revision ID: 8e4d0b7a2c95
+Revises: c71f2a9e5b08
+Create Date: 2026-10-18 19:41:06.273518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4d0b7a2c95'
+down_revision = 'c71f2a9e5b08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('change_log',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('op', sa.String(length=10), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_change_log_event_id_id', 'change_log', ['event_id', 'id'], unique=False)
+    op.create_index('ix_change_log_user_id_id', 'change_log', ['user_id', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_change_log_user_id_id', table_name='change_log')
+    op.drop_index('ix_change_log_event_id_id', table_name='change_log')
+    op.drop_table('change_log')
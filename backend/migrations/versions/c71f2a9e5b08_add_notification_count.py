@@ -0,0 +1,32 @@
+"""Add a repeat count to notifications
+
+Revision ID: c71f2a9e5b08
+Revises: 3b8e0f6c41d2
+Create Date: 2026-10-18 18:27:49.105836
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c71f2a9e5b08'
+down_revision = '3b8e0f6c41d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('count', sa.Integer(), server_default='1', nullable=False))
+
+    with op.batch_alter_table('notification_archive', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('count', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('notification_archive', schema=None) as batch_op:
+        batch_op.drop_column('count')
+
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.drop_column('count')
@@ -0,0 +1,26 @@
+"""Add user.data_updated_at for Last-Modified on the calendar feed
+
+Revision ID: ca053f578839
+Revises: d257eaacdc58
+Create Date: 2026-10-18 14:02:31.775810
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ca053f578839'
+down_revision = 'd257eaacdc58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('data_updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('data_updated_at')
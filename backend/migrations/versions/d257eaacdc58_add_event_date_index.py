@@ -0,0 +1,23 @@
+"""Add event(date) index for calendar range queries
+
+Revision ID: d257eaacdc58
+Revises: 61cb6fc981fe
+Create Date: 2026-10-18 13:20:44.091537
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd257eaacdc58'
+down_revision = '61cb6fc981fe'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_event_date', 'event', ['date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_event_date', table_name='event')
@@ -0,0 +1,27 @@
+"""Add a partial index of unread notifications per user
+
+Revision ID: d453a4bb4dcd
+Revises: fd1dff12e593
+Create Date: 2026-10-18 17:34:55.318420
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd453a4bb4dcd'
+down_revision = 'fd1dff12e593'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_notification_user_id_unread', 'notification', ['user_id'], unique=False,
+        sqlite_where=sa.text('read = 0'), postgresql_where=sa.text('read = false')
+    )
+
+
+def downgrade():
+    op.drop_index('ix_notification_user_id_unread', table_name='notification')
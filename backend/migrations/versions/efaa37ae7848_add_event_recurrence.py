@@ -0,0 +1,45 @@
+"""Add recurrence rules to events and sparse per-occurrence overrides
+
+Revision ID: efaa37ae7848
+Revises: ca053f578839
+Create Date: 2026-10-18 15:12:08.417263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'efaa37ae7848'
+down_revision = 'ca053f578839'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('recurrence_rule', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('recurrence_end', sa.DateTime(), nullable=True))
+
+    op.create_table('event_occurrence',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('original_date', sa.DateTime(), nullable=False),
+    sa.Column('cancelled', sa.Boolean(), server_default=sa.false(), nullable=False),
+    sa.Column('date', sa.DateTime(), nullable=True),
+    sa.Column('title', sa.String(length=200), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('location', sa.String(length=200), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['event.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('event_id', 'original_date', name='unique_event_occurrence')
+    )
+
+
+def downgrade():
+    op.drop_table('event_occurrence')
+
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_column('recurrence_end')
+        batch_op.drop_column('recurrence_rule')
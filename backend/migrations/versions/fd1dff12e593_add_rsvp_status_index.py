@@ -0,0 +1,25 @@
+"""Replace the rsvp event_id index with a covering (event_id, status) index
+
+Revision ID: fd1dff12e593
+Revises: 57b93e7e07e9
+Create Date: 2026-10-18 17:05:26.903187
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'fd1dff12e593'
+down_revision = '57b93e7e07e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_rsvp_event_id_status', 'rsvp', ['event_id', 'status'], unique=False)
+    op.drop_index('ix_rsvp_event_id', table_name='rsvp')
+
+
+def downgrade():
+    op.create_index('ix_rsvp_event_id', 'rsvp', ['event_id'], unique=False)
+    op.drop_index('ix_rsvp_event_id_status', table_name='rsvp')
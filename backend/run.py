@@ -1,19 +1,12 @@
 # backend/run.py
-from app import create_app, db
+from app import create_app
 import os
 
 app = create_app()
 
-# Initialize database tables
-with app.app_context():
-    try:
-        # Force table recreation to apply schema changes
-        print("Dropping and recreating tables...")
-        db.drop_all()
-        db.create_all()
-        print("Database tables created successfully")
-    except Exception as e:
-        print(f"Error creating database tables: {e}")
+# The schema is managed by Alembic migrations: run `flask db upgrade` before
+# starting (build.sh does). Nothing is created or dropped here, so restarts
+# and deploys keep their data
 
 if __name__ == '__main__':
     # Run with debug=False in production
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test for the RSVP upsert.
+
+Seeds a scratch database with one event and a handful of invited guests,
+then fires RSVPs for the same guests from many threads at once. Exits with
+status 1 if any request fails or if the event ends up with duplicate RSVPs
+or a wrong rsvps_count.
+
+    cd backend && python stress_rsvp_upsert.py [--threads 16] [--requests 50]
+
+Uses a temporary SQLite file by default. Set STRESS_DATABASE_URL to run
+against a scratch PostgreSQL database instead - its tables are dropped and
+recreated, so never point it at real data.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+from collections import Counter
+
+# Must be set before the app (and Config) is imported
+scratch_file = None
+if not os.environ.get('STRESS_DATABASE_URL'):
+    fd, scratch_file = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+os.environ['DATABASE_URL'] = os.environ.get('STRESS_DATABASE_URL') or f'sqlite:///{scratch_file}'
+# Notifications are checked from the outbox, so keep the workers from draining it
+os.environ['OUTBOX_WORKERS'] = '0'
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models import User, Event, RSVP, Invite, OutboxMessage
+
+GUESTS = 8
+
+def seed():
+    owner = User(username='stress_owner', email='stress_owner@example.com')
+    owner.set_password('password')
+    guests = [User(username=f'stress_guest{i}', email=f'stress_guest{i}@example.com') for i in range(GUESTS)]
+    for guest in guests:
+        guest.set_password('password')
+    db.session.add_all([owner, *guests])
+    db.session.flush()
+    
+    from datetime import datetime, timedelta
+    event = Event(title='Popular', date=datetime.utcnow() + timedelta(days=7), user_id=owner.id)
+    db.session.add(event)
+    db.session.flush()
+    db.session.add_all([
+        Invite(event_id=event.id, inviter_id=owner.id, invitee_email=guest.email, invitee_id=guest.id)
+        for guest in guests
+    ])
+    db.session.commit()
+    return event.id, [guest.id for guest in guests]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=50, help='RSVPs sent by each thread')
+    args = parser.parse_args()
+    
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        event_id, guest_ids = seed()
+        tokens = [f'Bearer {create_access_token(identity=str(guest_id))}' for guest_id in guest_ids]
+    
+    results = Counter()
+    lock = threading.Lock()
+    start = threading.Barrier(args.threads)
+    
+    def hammer(seed_value):
+        rng = random.Random(seed_value)
+        client = app.test_client()
+        start.wait()
+        for _ in range(args.requests):
+            response = client.post(
+                f'/api/rsvps/event/{event_id}',
+                json={'status': rng.choice(RSVP.STATUSES), 'message': 'stress'},
+                headers={'Authorization': rng.choice(tokens)}
+            )
+            with lock:
+                results[response.status_code] += 1
+    
+    threads = [threading.Thread(target=hammer, args=(i,)) for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    failures = []
+    errors = {code: count for code, count in results.items() if code not in (200, 201)}
+    if errors:
+        failures.append(f'failed requests by status code: {errors}')
+    
+    with app.app_context():
+        rows = RSVP.query.filter_by(event_id=event_id).count()
+        distinct = db.session.query(RSVP.user_id).filter_by(event_id=event_id).distinct().count()
+        counter = db.session.get(Event, event_id).rsvps_count
+        queued = OutboxMessage.query.count()
+        if rows != distinct:
+            failures.append(f'{rows} RSVP rows for {distinct} guests')
+        if counter != rows:
+            failures.append(f'rsvps_count is {counter}, expected {rows}')
+        if results[201] != rows:
+            failures.append(f'{results[201]} requests reported a new RSVP, expected {rows}')
+        if queued != sum(results.values()) - sum(errors.values()):
+            failures.append(f'{queued} notifications queued for {sum(results.values())} requests')
+        db.drop_all()
+    if scratch_file:
+        os.unlink(scratch_file)
+    
+    print(f'{sum(results.values())} requests from {args.threads} threads: {dict(results)}')
+    for failure in failures:
+        print(f'FAIL {failure}')
+    if failures:
+        return 1
+    print('RSVP upsert held up under concurrency')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -15,6 +15,12 @@ pip install --upgrade pip
 echo "Installing Python dependencies..."
 pip install -r requirements.txt
 
+# Bring the database schema up to date. A database the app created itself
+# with create_all has the schema of revision a8425ab8fc65 but no
+# alembic_version yet: run `flask db stamp a8425ab8fc65` once, then upgrade
+echo "Applying database migrations..."
+(cd backend && FLASK_APP=run.py flask db upgrade)
+
 # Install Node.js dependencies and build frontend
 echo "Installing Node.js dependencies..."
 cd frontend
@@ -13,20 +13,47 @@ const Navbar = () => {
   useEffect(() => {
     if (isAuthenticated) {
       fetchNotificationCount();
-      // Poll for new notifications every 30 seconds
-      const interval = setInterval(fetchNotificationCount, 30000);
-      return () => clearInterval(interval);
+      // The server pushes new notifications; refresh the count when one arrives.
+      // Each connection needs a fresh stream token, so reconnect by hand
+      // (resuming from the last event id) whenever the stream closes
+      let stream = null;
+      let retryTimer = null;
+      let lastEventId = null;
+      let stopped = false;
+      const connect = async () => {
+        try {
+          const { data } = await notificationAPI.getStreamToken();
+          if (stopped) return;
+          stream = new EventSource(notificationAPI.streamURL(data.token, lastEventId));
+          stream.addEventListener('notification', (event) => {
+            lastEventId = event.lastEventId;
+            fetchNotificationCount();
+          });
+          stream.onerror = () => {
+            stream.close();
+            if (!stopped) retryTimer = setTimeout(connect, 3000);
+          };
+        } catch (err) {
+          if (!stopped) retryTimer = setTimeout(connect, 30000);
+        }
+      };
+      connect();
+      return () => {
+        stopped = true;
+        clearTimeout(retryTimer);
+        if (stream) stream.close();
+      };
     }
   }, [isAuthenticated]);
 
   const fetchNotificationCount = async () => {
     try {
-      const [notificationsRes, invitesRes] = await Promise.all([
-        notificationAPI.getNotifications(),
+      const [unreadRes, invitesRes] = await Promise.all([
+        notificationAPI.getUnreadCount(),
         inviteAPI.getUserInvites()
       ]);
       
-      const unreadNotifications = notificationsRes.data.filter(n => !n.read).length;
+      const unreadNotifications = unreadRes.data.count;
       const pendingInvites = invitesRes.data.filter(i => i.status === 'pending').length;
       
       setNotificationCount(unreadNotifications + pendingInvites);
@@ -3,9 +3,14 @@ import { useState, useEffect } from 'react';
 import { notificationAPI, inviteAPI } from '../../utils/api';
 import LoadingSpinner from '../common/LoadingSpinner';
 
+// Types whose merged rows get a title that already states the count
+const COUNTED_TITLES = ['digest', 'rsvp_new', 'rsvp_update'];
+
 const Notifications = () => {
   const [notifications, setNotifications] = useState([]);
   const [invites, setInvites] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
 
@@ -21,6 +26,7 @@ const Notifications = () => {
       ]);
       
       setNotifications(notificationsRes.data);
+      setNextCursor(notificationsRes.headers['x-next-cursor'] || null);
       setInvites(invitesRes.data);
     } catch (err) {
       setError('Failed to fetch notifications');
@@ -28,6 +34,18 @@ const Notifications = () => {
     setLoading(false);
   };
 
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await notificationAPI.getNotifications(nextCursor);
+      setNotifications([...notifications, ...response.data]);
+      setNextCursor(response.headers['x-next-cursor'] || null);
+    } catch (err) {
+      setError('Failed to fetch more notifications');
+    }
+    setLoadingMore(false);
+  };
+
   const handleInviteResponse = async (inviteId, status, message = '') => {
     try {
       await inviteAPI.respondToInvite(inviteId, { status, message });
@@ -50,6 +68,15 @@ const Notifications = () => {
     }
   };
 
+  const handleMarkAllAsRead = async () => {
+    try {
+      await notificationAPI.markAllAsRead(notifications[0]);
+      setNotifications(notifications.map(notification => ({ ...notification, read: true })));
+    } catch (err) {
+      setError('Failed to mark notifications as read');
+    }
+  };
+
   const formatDate = (dateString) => {
     return new Date(dateString).toLocaleDateString() + ' at ' + 
            new Date(dateString).toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
@@ -111,7 +138,14 @@ const Notifications = () => {
 
       {/* Other Notifications */}
       <div>
-        <h2>All Notifications ({notifications.length})</h2>
+        <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
+          <h2>All Notifications ({notifications.length})</h2>
+          {unreadNotifications.length > 0 && (
+            <button onClick={handleMarkAllAsRead} className="btn btn-outline">
+              Mark all as read
+            </button>
+          )}
+        </div>
         {notifications.length === 0 ? (
           <p style={{ color: 'var(--text-secondary)' }}>No notifications</p>
         ) : (
@@ -127,8 +161,11 @@ const Notifications = () => {
             >
               <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'start' }}>
                 <div style={{ flex: 1 }}>
-                  <h4>{notification.title}</h4>
-                  {notification.message && <p>{notification.message}</p>}
+                  <h4>
+                    {notification.title}
+                    {!COUNTED_TITLES.includes(notification.type) && notification.count > 1 && ` (${notification.count} updates)`}
+                  </h4>
+                  {notification.message && <p style={{ whiteSpace: 'pre-line' }}>{notification.message}</p>}
                   <small style={{ color: 'var(--text-secondary)' }}>
                     {formatDate(notification.created_at)}
                   </small>
@@ -159,6 +196,17 @@ const Notifications = () => {
             </div>
           ))
         )}
+        {nextCursor && (
+          <div style={{ textAlign: 'center' }}>
+            <button
+              onClick={handleLoadMore}
+              className="btn btn-outline"
+              disabled={loadingMore}
+            >
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -61,6 +61,10 @@ const Profile = () => {
       setSuccess('');
       
       const response = await profileAPI.updateProfile(values);
+      // A new username comes with a new token carrying it
+      if (response.headers['x-access-token']) {
+        localStorage.setItem('token', response.headers['x-access-token']);
+      }
       setProfile(response.data);
       updateUser(response.data); // Update user in auth context
       setSuccess('Profile updated successfully!');
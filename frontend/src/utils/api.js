@@ -47,6 +47,24 @@ api.interceptors.response.use(
   }
 );
 
+// Same format as the X-Next-Cursor values the API hands out: url-safe
+// base64 of [sort value, id] without padding
+const pageCursor = (sortValue, id) =>
+  btoa(JSON.stringify([sortValue, id])).replace(/\+/g, '-').replace(/\//g, '_').replace(/=+$/, '');
+
+// List endpoints return one page and advertise the next in X-Next-Cursor;
+// follow it to the end and resolve like a single response with every row
+const getAllPages = async (url) => {
+  const data = [];
+  let cursor;
+  do {
+    const response = await api.get(url, { params: cursor ? { cursor } : {} });
+    data.push(...response.data);
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return { data };
+};
+
 // Rest of your API exports remain the same
 export const authAPI = {
   login: (credentials) => api.post('/auth/login', credentials),
@@ -54,9 +72,9 @@ export const authAPI = {
 };
 
 export const eventsAPI = {
-  getEvents: () => api.get('/events'),
-  getPastEvents: () => api.get('/events/past'),
-  getInvitedEvents: () => api.get('/events/invited'),
+  getEvents: () => getAllPages('/events'),
+  getPastEvents: () => getAllPages('/events/past'),
+  getInvitedEvents: () => getAllPages('/events/invited'),
   getEvent: (id) => api.get(`/events/${id}`),
   createEvent: (eventData) => api.post('/events', eventData),
   updateEvent: (id, eventData) => api.put(`/events/${id}`, eventData),
@@ -84,8 +102,18 @@ export const inviteAPI = {
 };
 
 export const notificationAPI = {
-  getNotifications: () => api.get('/rsvps/notifications'),
+  // Newest first, one page at a time; pass the previous X-Next-Cursor for the next
+  getNotifications: (cursor) => api.get('/rsvps/notifications', { params: cursor ? { cursor } : {} }),
+  getUnreadCount: () => api.get('/rsvps/notifications/unread-count'),
   markAsRead: (notificationId) => api.put(`/rsvps/notifications/${notificationId}/read`),
+  // One UPDATE for the newest notification shown and everything older; ones
+  // that arrived after the page loaded stay unread
+  markAllAsRead: (newest) => api.put('/rsvps/notifications/read', { before: pageCursor(newest.created_at, newest.id) }),
+  // EventSource cannot send an Authorization header, so streams are opened
+  // with a short-lived token from getStreamToken instead of the JWT
+  getStreamToken: () => api.get('/notifications/stream-token'),
+  streamURL: (token, lastEventId) => `${API_BASE_URL}/notifications/stream?token=${encodeURIComponent(token)}` +
+    (lastEventId ? `&last_event_id=${encodeURIComponent(lastEventId)}` : ''),
 };
 
 export const profileAPI = {
@@ -95,4 +123,10 @@ export const profileAPI = {
   deleteAccount: () => api.delete('/profile/delete'),
 };
 
+export const syncAPI = {
+  // Without a cursor, returns one marking now; then pass each response's cursor back.
+  // A 410 means the cursor is too old: reload everything and start from a new one
+  getChanges: (since) => api.get('/sync', { params: since ? { since } : {} }),
+};
+
 export default api;